@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0003_dashboard_filter_indexes"
+down_revision = "0002_dashboard_snapshot"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_applications_project_id_criticity", "applications", ["project_id", "criticity"])
+    op.create_index("ix_versions_application_id_end_of_support", "versions", ["application_id", "end_of_support"])
+    op.create_index(
+        "ix_dependencies_application_id_end_of_support", "dependencies", ["application_id", "end_of_support"]
+    )
+    op.create_index("ix_dependencies_name_end_of_support", "dependencies", ["name", "end_of_support"])
+    op.create_index("ix_dependencies_normalized_name", "dependencies", ["normalized_name"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dependencies_normalized_name", table_name="dependencies")
+    op.drop_index("ix_dependencies_name_end_of_support", table_name="dependencies")
+    op.drop_index("ix_dependencies_application_id_end_of_support", table_name="dependencies")
+    op.drop_index("ix_versions_application_id_end_of_support", table_name="versions")
+    op.drop_index("ix_applications_project_id_criticity", table_name="applications")
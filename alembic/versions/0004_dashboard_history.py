@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004_dashboard_history"
+down_revision = "0003_dashboard_filter_indexes"
+branch_labels = None
+depends_on = None
+
+COUNTER_COLUMNS = [
+    "total_items",
+    "obsolete_count",
+    "expiring_3_months",
+    "expiring_6_months",
+    "expiring_later",
+    "not_planned_count",
+    "planned_count",
+    "in_progress_count",
+    "done_count",
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dashboard_history",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False),
+        *[sa.Column(column, sa.Integer(), nullable=False, server_default="0") for column in COUNTER_COLUMNS],
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("day", "project_id", name="uq_dashboard_history_day_project"),
+    )
+    op.create_index("ix_dashboard_history_project_id_day", "dashboard_history", ["project_id", "day"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dashboard_history_project_id_day", table_name="dashboard_history")
+    op.drop_table("dashboard_history")
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0005_query_indexes"
+down_revision = "0004_dashboard_history"
+branch_labels = None
+depends_on = None
+
+# Composite indexes on application_id also serve lookups on application_id
+# alone, so no single-column index is added for those foreign keys.
+INDEXES = [
+    ("ix_versions_end_of_support", "versions", ["end_of_support"]),
+    ("ix_dependencies_end_of_support", "dependencies", ["end_of_support"]),
+    ("ix_timeline_events_application_id_created_at", "timeline_events", ["application_id", "created_at"]),
+    ("ix_comments_application_id_created_at", "comments", ["application_id", "created_at"]),
+    ("ix_notifications_sent_at", "notifications", ["sent_at"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
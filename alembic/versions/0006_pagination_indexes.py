@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0006_pagination_indexes"
+down_revision = "0005_query_indexes"
+branch_labels = None
+depends_on = None
+
+# Keyset pagination orders every list on (sort key, id). Secondary indexes
+# already end with the primary key on SQLite and InnoDB, so an index on the
+# sort key is enough for a page to start with an index seek.
+INDEXES = [
+    ("ix_applications_name", "applications", ["name"]),
+    ("ix_action_plans_due_date", "action_plans", ["due_date"]),
+    ("ix_action_plans_application_id_due_date", "action_plans", ["application_id", "due_date"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
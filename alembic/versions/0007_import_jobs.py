@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.entities import ImportJobStatus
+
+# revision identifiers, used by Alembic.
+revision = "0007_import_jobs"
+down_revision = "0006_pagination_indexes"
+branch_labels = None
+depends_on = None
+
+COUNTER_COLUMNS = [
+    "rows_processed",
+    "projects_created",
+    "applications_created",
+    "versions_created",
+    "dependencies_created",
+    "attempts",
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "import_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("filename", sa.String(length=255), nullable=False),
+        sa.Column("path", sa.String(length=500), nullable=False),
+        sa.Column("status", sa.Enum(ImportJobStatus), nullable=False, server_default=ImportJobStatus.queued.name),
+        *[sa.Column(column, sa.Integer(), nullable=False, server_default="0") for column in COUNTER_COLUMNS],
+        sa.Column("errors", sa.JSON(), nullable=False, server_default="[]"),
+        sa.Column("started_at", sa.DateTime(timezone=True)),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True)),
+        sa.Column("finished_at", sa.DateTime(timezone=True)),
+        sa.Column("created_by_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="SET NULL")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_import_jobs_status_heartbeat_at", "import_jobs", ["status", "heartbeat_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_jobs_status_heartbeat_at", table_name="import_jobs")
+    op.drop_table("import_jobs")
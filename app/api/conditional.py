@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Iterable, Optional, Tuple
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+Validator = Tuple[int, Optional[int], Optional[datetime]]
+
+
+def validator_statement(model):
+    """Cheap fingerprint of a table: row count, highest id and last modification."""
+    return select(func.count(model.id), func.max(model.id), func.max(model.updated_at))
+
+
+async def run_validator(db: AsyncSession, statement) -> Validator:
+    count, max_id, last_modified = (await db.execute(statement)).one()
+    return count, max_id, last_modified
+
+
+async def collection_validator(db: AsyncSession, model, *criteria) -> Validator:
+    return await run_validator(db, validator_statement(model).where(*criteria))
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    validators: Iterable[Validator],
+    *extra: Any,
+) -> Optional[Response]:
+    """Set ETag/Last-Modified headers and answer ``If-None-Match`` with 304 when the validators match.
+
+    ``extra`` holds whatever else the representation depends on (query
+    parameters, current date...). Returns the 304 response to send, or
+    ``None`` when the full body must be produced.
+    """
+    validators = list(validators)
+    digest = hashlib.sha1(repr((validators, extra)).encode("utf-8")).hexdigest()
+    headers = {"ETag": f'W/"{digest}"', "Cache-Control": "private, no-cache"}
+    modified = [last_modified for _, _, last_modified in validators if last_modified is not None]
+    if modified:
+        headers["Last-Modified"] = format_datetime(max(_as_utc(value) for value in modified), usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        if "*" in candidates or headers["ETag"] in candidates or headers["ETag"][2:] in candidates:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return None
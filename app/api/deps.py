@@ -1,17 +1,24 @@
 from __future__ import annotations
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.audit import set_actor
+from app.core.database import SAFE_METHODS, get_db, get_read_db
 from app.models.entities import User, UserRole
 from app.utils.security import decode_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+async def get_current_user(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_read_db),
+    token: str = Depends(oauth2_scheme),
+) -> User:
+    """The user of the token, read from the replica for read-only requests that are not pinned to the primary."""
     try:
         payload = decode_token(token)
     except Exception as exc:  # pragma: no cover - handled as auth error
@@ -21,9 +28,11 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
     if user_id is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token invalide")
 
-    user = db.get(User, int(user_id))
+    session = read_db if request.method in SAFE_METHODS else db
+    user = await session.get(User, int(user_id))
     if not user or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Utilisateur inactif")
+    set_actor(db, user)
     return user
 
 
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import and_, false, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# (column, descending). The primary key must come last so that the order is total.
+SortKey = Tuple[Any, bool]
+
+
+@dataclass
+class PageParams:
+    cursor: Optional[str]
+    limit: int
+
+
+def page_params(
+    cursor: Optional[str] = Query(default=None, description="Curseur renvoyé dans l'en-tête X-Next-Cursor"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Taille de page"),
+) -> PageParams:
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order: Sequence[SortKey]) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(order):
+            raise ValueError(cursor)
+        return [_decode_value(column, value) for (column, _), value in zip(order, values)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Curseur invalide")
+
+
+def _after(column, descending: bool, value: Any):
+    """Rows strictly after ``value`` on one sort key.
+
+    NULLs sort first in ascending order and last in descending order, as on
+    SQLite and MariaDB.
+    """
+    if value is None:
+        # Only non-NULL values follow NULL in ascending order, nothing in descending order.
+        return false() if descending else column.isnot(None)
+    if descending:
+        return or_(column < value, column.is_(None))
+    return column > value
+
+
+def _equal(column, value: Any):
+    return column.is_(None) if value is None else column == value
+
+
+def _leading_bound(column, descending: bool, value: Any):
+    """Range on the first sort key implied by the keyset condition.
+
+    Redundant with the OR-ed clauses, but it is what lets the database seek
+    into the index instead of walking it from the start.
+    """
+    if not descending:
+        return column >= value if value is not None else None
+    if value is None:
+        return column.is_(None)
+    return column <= value if not column.expression.nullable else None
+
+
+def keyset_condition(order: Sequence[SortKey], values: Sequence[Any]):
+    """``(k1, ..., id) > cursor`` in the order of the sort keys."""
+    clauses = []
+    for position, (column, descending) in enumerate(order):
+        preceding = [_equal(previous, value) for (previous, _), value in zip(order[:position], values)]
+        clauses.append(and_(*preceding, _after(column, descending, values[position])))
+    condition = or_(*clauses)
+    bound = _leading_bound(order[0][0], order[0][1], values[0])
+    return condition if bound is None else and_(bound, condition)
+
+
+async def paginate(
+    db: AsyncSession,
+    statement,
+    order: Sequence[SortKey],
+    page: PageParams,
+    response: Response,
+    scalars: bool = True,
+) -> list:
+    """Run one page of ``statement`` and set ``X-Next-Cursor`` when more rows follow.
+
+    Pages resume from the last row's sort keys instead of an OFFSET, so a
+    deep page costs the same index range scan as the first one. With
+    ``scalars=False`` the Core rows are returned as is; they must include the
+    sort columns.
+    """
+    if page.cursor:
+        statement = statement.where(keyset_condition(order, decode_cursor(page.cursor, order)))
+    statement = statement.order_by(*(column.desc() if descending else column.asc() for column, descending in order))
+    result = await db.execute(statement.limit(page.limit + 1))
+    rows = result.scalars().all() if scalars else result.all()
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, column.key) for column, _ in order])
+    return rows
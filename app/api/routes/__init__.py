@@ -7,6 +7,7 @@ from . import (
     dashboard,
     dependencies,
     import_export,
+    metrics,
     notifications,
     projects,
     settings,
@@ -24,6 +25,7 @@ __all__ = [
     "dashboard",
     "dependencies",
     "import_export",
+    "metrics",
     "notifications",
     "projects",
     "settings",
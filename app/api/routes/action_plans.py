@@ -3,11 +3,13 @@ from __future__ import annotations
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.pagination import PageParams, page_params, paginate
+from app.api.rows import Fields, fields_param, rows_response, select_schema
 from app.api.deps import get_current_user, require_role
-from app.core.database import get_db
-from app.models.entities import ActionPlan, TimelineEvent, UserRole
+from app.core.database import get_db, get_read_db
+from app.models.entities import ActionPlan, UserRole
 from app.schemas.entities import ActionPlan as ActionPlanSchema
 from app.schemas.entities import ActionPlanCreate, ActionPlanUpdate
 
@@ -17,34 +19,31 @@ router = APIRouter(prefix="/action-plans", tags=["action_plans"])
 @router.get("/", response_model=List[ActionPlanSchema])
 async def list_action_plans(
     application_id: int | None = None,
-    db: Session = Depends(get_db),
+    *,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Fields = Depends(fields_param(ActionPlanSchema)),
+    db: AsyncSession = Depends(get_read_db),
     __: None = Depends(get_current_user),
 ) -> List[ActionPlan]:
-    query = db.query(ActionPlan)
+    order = [(ActionPlan.due_date, False), (ActionPlan.id, False)]
+    statement = select_schema(ActionPlanSchema, ActionPlan, fields, include=[column for column, _ in order])
     if application_id:
-        query = query.filter(ActionPlan.application_id == application_id)
-    return query.order_by(ActionPlan.due_date).all()
+        statement = statement.where(ActionPlan.application_id == application_id)
+    rows = await paginate(db, statement, order, page, response, scalars=False)
+    return rows_response(ActionPlanSchema, rows, response, fields=fields)
 
 
 @router.post("/", response_model=ActionPlanSchema, status_code=status.HTTP_201_CREATED)
 async def create_action_plan(
     payload: ActionPlanCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> ActionPlan:
     action_plan = ActionPlan(**payload.dict())
     db.add(action_plan)
-    db.commit()
-    db.refresh(action_plan)
-    event = TimelineEvent(
-        application_id=action_plan.application_id,
-        entity_type="action_plan",
-        entity_id=action_plan.id,
-        event_type="create",
-        description=f"Plan d'action '{action_plan.title}' créé",
-    )
-    db.add(event)
-    db.commit()
+    await db.commit()
+    await db.refresh(action_plan)
     return action_plan
 
 
@@ -52,26 +51,17 @@ async def create_action_plan(
 async def update_action_plan(
     action_plan_id: int,
     payload: ActionPlanUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> ActionPlan:
-    action_plan = db.get(ActionPlan, action_plan_id)
+    action_plan = await db.get(ActionPlan, action_plan_id)
     if not action_plan:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan d'action introuvable")
     for field, value in payload.dict(exclude_unset=True).items():
         setattr(action_plan, field, value)
     db.add(action_plan)
-    db.commit()
-    db.refresh(action_plan)
-    event = TimelineEvent(
-        application_id=action_plan.application_id,
-        entity_type="action_plan",
-        entity_id=action_plan.id,
-        event_type="update",
-        description=f"Plan d'action '{action_plan.title}' mis à jour",
-    )
-    db.add(event)
-    db.commit()
+    await db.commit()
+    await db.refresh(action_plan)
     return action_plan
 
 
@@ -90,23 +80,12 @@ async def update_action_plan(
 )
 async def delete_action_plan(
     action_plan_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> Response:
-    action_plan = db.get(ActionPlan, action_plan_id)
+    action_plan = await db.get(ActionPlan, action_plan_id)
     if not action_plan:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan d'action introuvable")
-    title = action_plan.title
-    application_id = action_plan.application_id
-    db.delete(action_plan)
-    db.commit()
-    event = TimelineEvent(
-        application_id=application_id,
-        entity_type="action_plan",
-        entity_id=action_plan_id,
-        event_type="delete",
-        description=f"Plan d'action '{title}' supprimé",
-    )
-    db.add(event)
-    db.commit()
+    await db.delete(action_plan)
+    await db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -2,15 +2,21 @@ from __future__ import annotations
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from sqlalchemy import or_
-from sqlalchemy.orm import Session, joinedload
-
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.api.conditional import conditional_response, run_validator, validator_statement
+from app.api.pagination import PageParams, page_params, paginate
+from app.api.rows import Fields, fields_param, rows_response, select_schema
 from app.api.deps import get_current_user, require_role
-from app.core.database import get_db
-from app.models.entities import Application, ApplicationStatus, CriticityLevel, Project, TimelineEvent, UserRole
+from app.core.database import get_db, get_read_db
+from app.models.entities import Application, ApplicationStatus, CriticityLevel, Project, UserRole
 from app.schemas.entities import Application as ApplicationSchema
 from app.schemas.entities import ApplicationCreate, ApplicationDetail, ApplicationUpdate
+from app.services.dashboard import dashboard_cache
+from app.services.snapshot import DashboardSnapshotService, application_contributions
 
 router = APIRouter(prefix="/applications", tags=["applications"])
 
@@ -54,47 +60,65 @@ async def list_applications(
     criticity: Optional[str] = Query(default=None, description="Criticité à filtrer"),
     status_filter: Optional[str] = Query(default=None, alias="status"),
     search: Optional[str] = Query(default=None, description="Recherche plein texte"),
-    db: Session = Depends(get_db),
+    *,
+    page: PageParams = Depends(page_params),
+    fields: Fields = Depends(fields_param(ApplicationSchema)),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     __: None = Depends(get_current_user),
 ) -> List[Application]:
-    query = db.query(Application)
-    query = apply_filters(query, project_id, criticity, status_filter, search)
-    return query.order_by(Application.name).all()
+    validator = await run_validator(
+        db, apply_filters(validator_statement(Application), project_id, criticity, status_filter, search)
+    )
+    not_modified = conditional_response(
+        request, response, [validator], project_id, criticity, status_filter, search, page.cursor, page.limit, fields
+    )
+    if not_modified:
+        return not_modified
+    order = [(Application.name, False), (Application.id, False)]
+    statement = select_schema(ApplicationSchema, Application, fields, include=[column for column, _ in order])
+    statement = apply_filters(statement, project_id, criticity, status_filter, search)
+    rows = await paginate(db, statement, order, page, response, scalars=False)
+    return rows_response(ApplicationSchema, rows, response, fields=fields)
 
 
 @router.post("/", response_model=ApplicationSchema, status_code=status.HTTP_201_CREATED)
 async def create_application(
     payload: ApplicationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> Application:
-    project = db.get(Project, payload.project_id)
+    project = await db.get(Project, payload.project_id)
     if not project:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Projet inconnu")
     application = Application(**payload.dict())
     db.add(application)
-    db.commit()
-    db.refresh(application)
+    added = application_contributions(application)
+    await db.run_sync(lambda session: DashboardSnapshotService(session).apply(added=added))
+    await db.commit()
+    dashboard_cache.invalidate()
+    await db.refresh(application)
     return application
 
 
 @router.get("/{application_id}", response_model=ApplicationDetail)
 async def get_application(
     application_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     __: None = Depends(get_current_user),
 ) -> Application:
-    application = (
-        db.query(Application)
+    statement = (
+        select(Application)
         .options(
-            joinedload(Application.versions),
-            joinedload(Application.dependencies),
-            joinedload(Application.action_plans),
-            joinedload(Application.comments),
+            selectinload(Application.versions),
+            selectinload(Application.dependencies),
+            selectinload(Application.action_plans),
+            selectinload(Application.comments),
         )
-        .filter(Application.id == application_id)
-        .one_or_none()
+        .where(Application.id == application_id)
     )
+    application = (await db.scalars(statement)).one_or_none()
     if not application:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Application introuvable")
     return application
@@ -104,32 +128,24 @@ async def get_application(
 async def update_application(
     application_id: int,
     payload: ApplicationUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> Application:
-    application = db.get(Application, application_id)
+    application = await db.get(Application, application_id)
     if not application:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Application introuvable")
 
+    previous = application_contributions(application)
     changes = payload.dict(exclude_unset=True)
     for field, value in changes.items():
         setattr(application, field, value)
 
     db.add(application)
-    db.commit()
-    db.refresh(application)
-
-    if changes:
-        event = TimelineEvent(
-            application_id=application.id,
-            entity_type="application",
-            entity_id=application.id,
-            event_type="update",
-            description=", ".join(f"{field} mis à jour" for field in changes.keys()),
-        )
-        db.add(event)
-        db.commit()
-
+    added = application_contributions(application)
+    await db.run_sync(lambda session: DashboardSnapshotService(session).apply(added=added, removed=previous))
+    await db.commit()
+    dashboard_cache.invalidate()
+    await db.refresh(application)
     return application
 
 
@@ -138,12 +154,14 @@ async def update_application(
 )
 async def delete_application(
     application_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.admin)),
 ) -> Response:
-    application = db.get(Application, application_id)
+    application = await db.get(Application, application_id)
     if not application:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Application introuvable")
-    db.delete(application)
-    db.commit()
+    await db.run_sync(lambda session: DashboardSnapshotService(session).remove_application(application_id))
+    await db.delete(application)
+    await db.commit()
+    dashboard_cache.invalidate()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -12,7 +12,7 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/token", response_model=Token)
 async def login(credentials: LoginRequest, auth_service: AuthService = Depends(get_auth_service)) -> Token:
-    return auth_service.authenticate(credentials)
+    return await auth_service.authenticate(credentials)
 
 
 @router.get("/me", response_model=AuthenticatedUser)
@@ -26,5 +26,5 @@ async def change_password(
     current_user: User = Depends(get_current_user),
     auth_service: AuthService = Depends(get_auth_service),
 ) -> dict[str, str]:
-    auth_service.change_password(current_user, payload.current_password, payload.new_password)
+    await auth_service.change_password(current_user, payload.current_password, payload.new_password)
     return {"status": "password_updated"}
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import collection_validator, conditional_response
+from app.api.pagination import PageParams, page_params, paginate
+from app.api.rows import Fields, fields_param, rows_response, select_schema
 from app.api.deps import require_role
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.entities import TechnologyLifecycle, UserRole
 from app.schemas.entities import TechnologyLifecycle as TechnologyLifecycleSchema
 from app.schemas.entities import TechnologyLifecycleCreate, TechnologyLifecycleUpdate
@@ -15,20 +18,33 @@ router = APIRouter(prefix="/catalog", tags=["catalog"])
 
 
 @router.get("/", response_model=List[TechnologyLifecycleSchema])
-async def list_catalog(db: Session = Depends(get_db)) -> List[TechnologyLifecycle]:
-    return db.query(TechnologyLifecycle).order_by(TechnologyLifecycle.name).all()
+async def list_catalog(
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Fields = Depends(fields_param(TechnologyLifecycleSchema)),
+    db: AsyncSession = Depends(get_read_db),
+) -> List[TechnologyLifecycle]:
+    validator = await collection_validator(db, TechnologyLifecycle)
+    not_modified = conditional_response(request, response, [validator], page.cursor, page.limit, fields)
+    if not_modified:
+        return not_modified
+    order = [(TechnologyLifecycle.name, False), (TechnologyLifecycle.id, False)]
+    statement = select_schema(TechnologyLifecycleSchema, TechnologyLifecycle, fields, include=[column for column, _ in order])
+    rows = await paginate(db, statement, order, page, response, scalars=False)
+    return rows_response(TechnologyLifecycleSchema, rows, response, fields=fields)
 
 
 @router.post("/", response_model=TechnologyLifecycleSchema, status_code=status.HTTP_201_CREATED)
 async def create_catalog_entry(
     payload: TechnologyLifecycleCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> TechnologyLifecycle:
     entry = TechnologyLifecycle(**payload.dict())
     db.add(entry)
-    db.commit()
-    db.refresh(entry)
+    await db.commit()
+    await db.refresh(entry)
     return entry
 
 
@@ -36,17 +52,17 @@ async def create_catalog_entry(
 async def update_catalog_entry(
     entry_id: int,
     payload: TechnologyLifecycleUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> TechnologyLifecycle:
-    entry = db.get(TechnologyLifecycle, entry_id)
+    entry = await db.get(TechnologyLifecycle, entry_id)
     if not entry:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Entrée introuvable")
     for field, value in payload.dict(exclude_unset=True).items():
         setattr(entry, field, value)
     db.add(entry)
-    db.commit()
-    db.refresh(entry)
+    await db.commit()
+    await db.refresh(entry)
     return entry
 
 
@@ -55,12 +71,12 @@ async def update_catalog_entry(
 )
 async def delete_catalog_entry(
     entry_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> Response:
-    entry = db.get(TechnologyLifecycle, entry_id)
+    entry = await db.get(TechnologyLifecycle, entry_id)
     if not entry:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Entrée introuvable")
-    db.delete(entry)
-    db.commit()
+    await db.delete(entry)
+    await db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,20 +1,105 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from datetime import date, timedelta
+from typing import Dict, List, Literal, Optional
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
-from app.schemas.dashboard import DashboardMetrics
-from app.services.dashboard import DashboardService
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.conditional import collection_validator, conditional_response
+from app.api.deps import get_current_user, require_role
+from app.core.database import get_read_db, pinned_to_primary
+from app.schemas.dashboard import DashboardHistoryPoint, DashboardMetrics, DeadlineHistogram
+from app.schemas.filters import DashboardFilter
+from app.models.entities import Application, Dependency, Project, UserRole, Version
+from app.services.dashboard import DashboardService, dashboard_cache
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
 @router.get("/metrics", response_model=DashboardMetrics)
 async def get_dashboard_metrics(
-    db: Session = Depends(get_db),
+    filters: DashboardFilter = Depends(),
+    shared_min: int = Query(default=2, ge=2, description="Nombre minimal d'usages d'une dépendance partagée"),
+    shared_limit: Optional[int] = Query(default=None, ge=1, description="Nombre maximal d'alertes de dépendances"),
+    *,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     __: None = Depends(get_current_user),
 ) -> DashboardMetrics:
-    service = DashboardService(db)
-    return service.get_metrics()
+    key = (tuple(sorted(filters.dict().items())), shared_min, shared_limit)
+    # Buckets depend on the current date, hence its presence in the validator.
+    validators = [await collection_validator(db, model) for model in (Version, Dependency, Application, Project)]
+    not_modified = conditional_response(request, response, validators, key, date.today())
+    if not_modified:
+        return not_modified
+
+    def compute():
+        return db.run_sync(
+            lambda session: DashboardService(session).get_metrics(
+                filters, shared_min_count=shared_min, shared_limit=shared_limit
+            )
+        )
+
+    if pinned_to_primary(request):
+        # The shared cache may hold values computed from a lagging replica.
+        return await compute()
+    # Keyed by the validators too: a hit always matches the tables as they stand.
+    return await dashboard_cache.get_or_compute((key, tuple(validators), date.today()), compute)
+
+
+@router.get("/priorities", response_model=List[Dict[str, str]])
+async def get_dashboard_priorities(
+    limit: int = Query(default=10, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    filters: DashboardFilter = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    __: None = Depends(get_current_user),
+) -> List[Dict[str, str]]:
+    return await db.run_sync(
+        lambda session: DashboardService(session).top_priorities(limit=limit, offset=offset, filters=filters)
+    )
+
+
+@router.get("/histogram", response_model=DeadlineHistogram)
+async def get_deadline_histogram(
+    granularity: Literal["month", "quarter", "year"] = "quarter",
+    split_by: Optional[Literal["type", "project", "criticity"]] = None,
+    item_type: Optional[Literal["version", "dependency"]] = None,
+    start: Optional[date] = Query(default=None, description="Première date de fin de support prise en compte"),
+    end: Optional[date] = Query(default=None, description="Dernière date de fin de support prise en compte"),
+    filters: DashboardFilter = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    __: None = Depends(get_current_user),
+) -> DeadlineHistogram:
+    if start and end and start > end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Période invalide")
+    return await db.run_sync(
+        lambda session: DashboardService(session).deadline_histogram(granularity, split_by, start, end, item_type, filters)
+    )
+
+
+@router.get("/history", response_model=List[DashboardHistoryPoint])
+async def get_dashboard_history(
+    start: Optional[date] = Query(default=None, description="Début de la période (défaut: un an avant la fin)"),
+    end: Optional[date] = Query(default=None, description="Fin de la période (défaut: aujourd'hui)"),
+    granularity: Literal["day", "week", "month"] = "day",
+    project_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_read_db),
+    __: None = Depends(get_current_user),
+) -> List[DashboardHistoryPoint]:
+    end = end or date.today()
+    start = start or end - timedelta(days=365)
+    if start > end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Période invalide")
+    return await db.run_sync(
+        lambda session: DashboardService(session).history(start, end, granularity=granularity, project_id=project_id)
+    )
+
+
+@router.get("/cache")
+async def get_dashboard_cache_stats(
+    __: None = Depends(require_role(UserRole.admin)),
+) -> dict[str, int]:
+    return dashboard_cache.stats()
@@ -1,47 +1,56 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import require_role
 from app.core.database import get_db
-from app.models.entities import Application, Dependency, TechnologyLifecycle, TimelineEvent, UserRole
+from app.models.entities import Application, Dependency, TechnologyLifecycle, UserRole
+from app.schemas.bulk import BulkResult, DependencyBulkRequest
 from app.schemas.entities import Dependency as DependencySchema
 from app.schemas.entities import DependencyCreate, DependencyUpdate
+from app.services.bulk import DEPENDENCIES, BulkInventoryService
+from app.services.dashboard import dashboard_cache
+from app.services.snapshot import DashboardSnapshotService, dependency_contributions
 
 router = APIRouter(prefix="/dependencies", tags=["dependencies"])
 
 
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_dependencies(
+    payload: DependencyBulkRequest,
+    db: AsyncSession = Depends(get_db),
+    __: None = Depends(require_role(UserRole.contributor)),
+) -> BulkResult:
+    """Create, update and delete dependencies in one transaction, with one result per item."""
+    result = await db.run_sync(lambda session: BulkInventoryService(session).apply(DEPENDENCIES, payload))
+    if result.created or result.updated or result.deleted:
+        dashboard_cache.invalidate()
+    return result
+
+
 @router.post("/", response_model=DependencySchema, status_code=status.HTTP_201_CREATED)
 async def create_dependency(
     payload: DependencyCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> Dependency:
-    application = db.get(Application, payload.application_id)
+    application = await db.get(Application, payload.application_id)
     if not application:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Application inconnue")
     dependency = Dependency(**payload.dict())
     if not dependency.normalized_name and dependency.name:
-        catalog = (
-            db.query(TechnologyLifecycle)
-            .filter(TechnologyLifecycle.name.ilike(dependency.name))
-            .one_or_none()
-        )
+        statement = select(TechnologyLifecycle).where(TechnologyLifecycle.name.ilike(dependency.name))
+        catalog = (await db.scalars(statement)).one_or_none()
         if catalog:
             dependency.normalized_name = catalog.name
     db.add(dependency)
-    db.commit()
-    db.refresh(dependency)
-    event = TimelineEvent(
-        application_id=dependency.application_id,
-        entity_type="dependency",
-        entity_id=dependency.id,
-        event_type="create",
-        description=f"Dépendance {dependency.name} ajoutée",
-    )
-    db.add(event)
-    db.commit()
+    added = dependency_contributions(dependency)
+    await db.run_sync(lambda session: DashboardSnapshotService(session).apply(added=added))
+    await db.commit()
+    dashboard_cache.invalidate()
+    await db.refresh(dependency)
     return dependency
 
 
@@ -49,26 +58,21 @@ async def create_dependency(
 async def update_dependency(
     dependency_id: int,
     payload: DependencyUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> Dependency:
-    dependency = db.get(Dependency, dependency_id)
+    dependency = await db.get(Dependency, dependency_id)
     if not dependency:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dépendance introuvable")
+    previous = dependency_contributions(dependency)
     for field, value in payload.dict(exclude_unset=True).items():
         setattr(dependency, field, value)
     db.add(dependency)
-    db.commit()
-    db.refresh(dependency)
-    event = TimelineEvent(
-        application_id=dependency.application_id,
-        entity_type="dependency",
-        entity_id=dependency.id,
-        event_type="update",
-        description=f"Dépendance {dependency.name} mise à jour",
-    )
-    db.add(event)
-    db.commit()
+    added = dependency_contributions(dependency)
+    await db.run_sync(lambda session: DashboardSnapshotService(session).apply(added=added, removed=previous))
+    await db.commit()
+    dashboard_cache.invalidate()
+    await db.refresh(dependency)
     return dependency
 
 
@@ -77,23 +81,15 @@ async def update_dependency(
 )
 async def delete_dependency(
     dependency_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> Response:
-    dependency = db.get(Dependency, dependency_id)
+    dependency = await db.get(Dependency, dependency_id)
     if not dependency:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Dépendance introuvable")
-    dependency_name = dependency.name
-    application_id = dependency.application_id
-    db.delete(dependency)
-    db.commit()
-    event = TimelineEvent(
-        application_id=application_id,
-        entity_type="dependency",
-        entity_id=dependency_id,
-        event_type="delete",
-        description=f"Dépendance {dependency_name} supprimée",
-    )
-    db.add(event)
-    db.commit()
+    removed = dependency_contributions(dependency)
+    await db.run_sync(lambda session: DashboardSnapshotService(session).apply(removed=removed))
+    await db.delete(dependency)
+    await db.commit()
+    dashboard_cache.invalidate()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -2,41 +2,77 @@ from __future__ import annotations
 
 import csv
 import io
-from typing import List, Optional
+from typing import BinaryIO, List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, HTTPException, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.api.deps import get_current_user, require_role
 from app.api.routes.applications import apply_filters
-from app.core.database import get_db
-from app.models.entities import Application, UserRole
+from app.core.database import SessionLocal, get_db, get_read_db
+from app.models.entities import Application, ImportJob, User, UserRole
+from app.schemas.imports import ImportJob as ImportJobSchema
+from app.schemas.imports import ImportPreview
+from app.services.import_jobs import ImportJobService, store_upload
+from app.services.import_preview import ImportPreviewService
 from app.services.importer import CSVImportService, CSV_HEADERS
+from app.tasks.imports import import_workers
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
 
 @router.get("/template")
 async def download_template(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> StreamingResponse:
-    service = CSVImportService(db)
-    content = service.generate_template()
+    content = await db.run_sync(lambda session: CSVImportService(session).generate_template())
     return StreamingResponse(io.BytesIO(content), media_type="text/csv", headers={"Content-Disposition": "attachment; filename=inventory_template.csv"})
 
 
-@router.post("/import", status_code=status.HTTP_202_ACCEPTED)
+def preview_import(binary: BinaryIO) -> dict:
+    binary.seek(0)
+    with SessionLocal() as session:
+        return ImportPreviewService(session).preview(binary)
+
+
+@router.post("/import", response_model=Union[ImportJobSchema, ImportPreview], status_code=status.HTTP_202_ACCEPTED)
 async def import_inventory(
     file: UploadFile,
-    db: Session = Depends(get_db),
-    __: None = Depends(require_role(UserRole.contributor)),
-) -> dict[str, int]:
+    response: Response,
+    dry_run: bool = False,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(require_role(UserRole.contributor)),
+) -> ImportJob | dict:
+    """Queue the import of a CSV inventory; its progress is read from ``GET /inventory/import/{job_id}``.
+
+    With ``dry_run``, nothing is written: the response tells what the import would create or skip.
+    """
     if not file.filename or not file.filename.endswith(".csv"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Seuls les fichiers CSV sont supportés")
-    service = CSVImportService(db)
-    return service.import_csv(file)
+    if dry_run:
+        response.status_code = status.HTTP_200_OK
+        return await run_in_threadpool(preview_import, file.file)
+    path = await run_in_threadpool(store_upload, file.file)
+    job = await db.run_sync(lambda session: ImportJobService(session).enqueue(file.filename, path, user.id))
+    import_workers.wake()
+    return job
+
+
+@router.get("/import/{job_id}", response_model=ImportJobSchema)
+async def get_import_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    __: None = Depends(require_role(UserRole.contributor)),
+) -> ImportJob:
+    job = await db.get(ImportJob, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import introuvable")
+    return job
 
 
 @router.get("/export")
@@ -45,12 +81,13 @@ async def export_inventory(
     criticity: Optional[str] = None,
     status_filter: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     __: None = Depends(get_current_user),
 ) -> StreamingResponse:
-    query = db.query(Application)
-    query = apply_filters(query, project_id, criticity, status_filter, search)
-    applications: List[Application] = query.all()
+    statement = apply_filters(select(Application), project_id, criticity, status_filter, search).options(
+        selectinload(Application.project), selectinload(Application.versions), selectinload(Application.dependencies)
+    )
+    applications: List[Application] = (await db.scalars(statement)).all()
 
     output = io.StringIO()
     writer = csv.DictWriter(output, fieldnames=CSV_HEADERS)
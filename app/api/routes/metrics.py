@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+
+from app.api.deps import require_role
+from app.core.metrics import database_metrics
+from app.models.entities import UserRole
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/")
+async def get_internal_metrics(
+    __: None = Depends(require_role(UserRole.admin)),
+) -> dict:
+    """Counters and histograms of the database pools and statements; the dashboard cache has ``/dashboard/cache``."""
+    return {"database": database_metrics.snapshot()}
@@ -2,13 +2,18 @@ from __future__ import annotations
 
 from typing import Iterable, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from pydantic import BaseModel, EmailStr
-from sqlalchemy.orm import Session, joinedload
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
+from app.api.pagination import PageParams, page_params, paginate
+from app.api.rows import Fields, field_converter, fields_param, rows_response, select_schema
 from app.api.deps import require_role
-from app.core.database import get_db
-from app.models.entities import Application, Notification, UserRole
+from app.core.database import get_db, get_read_db
+from app.models.entities import Application, Notification, NotificationType, UserRole
 from app.schemas.entities import Notification as NotificationSchema
 from app.services.notifications import NotificationService, format_notification_html
 
@@ -32,25 +37,32 @@ class TeamsNotificationRequest(BaseModel):
 
 @router.get("/", response_model=List[NotificationSchema])
 async def list_notifications(
-    db: Session = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Fields = Depends(fields_param(NotificationSchema)),
+    db: AsyncSession = Depends(get_read_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> List[Notification]:
-    return db.query(Notification).order_by(Notification.sent_at.desc()).all()
+    order = [(Notification.sent_at, True), (Notification.id, True)]
+    statement = select_schema(NotificationSchema, Notification, fields, include=[column for column, _ in order])
+    rows = await paginate(db, statement, order, page, response, scalars=False)
+    # Stored as the comma separated list of the e-mail headers.
+    converters = {"recipients": field_converter(NotificationSchema, "recipients")}
+    return rows_response(NotificationSchema, rows, response, converters, fields)
 
 
 @router.post("/email", response_model=NotificationSchema, status_code=status.HTTP_201_CREATED)
 async def send_email_notification(
     payload: EmailNotificationRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> Notification:
-    service = NotificationService(db)
-    application = (
-        db.query(Application)
-        .options(joinedload(Application.project), joinedload(Application.versions), joinedload(Application.dependencies))
-        .filter(Application.id == payload.application_id)
-        .one_or_none()
+    statement = (
+        select(Application)
+        .options(selectinload(Application.project), selectinload(Application.versions), selectinload(Application.dependencies))
+        .where(Application.id == payload.application_id)
     )
+    application = (await db.scalars(statement)).one_or_none()
     if not application:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Application introuvable")
 
@@ -62,24 +74,30 @@ async def send_email_notification(
         dependency = next((d for d in application.dependencies if d.id == payload.dependency_id), None)
 
     body = format_notification_html(application, version, dependency)
-    return service.send_email_notification("application", application.id, payload.recipients, payload.subject, body)
+    # SMTP delivery blocks: keep it off the event loop.
+    status_msg = await run_in_threadpool(NotificationService.deliver_email, payload.recipients, payload.subject, body)
+    return await db.run_sync(
+        lambda session: NotificationService(session).log_notification(
+            "application", application.id, NotificationType.email, payload.recipients, status_msg, body
+        )
+    )
 
 
 @router.post("/teams", response_model=NotificationSchema, status_code=status.HTTP_201_CREATED)
 async def send_teams_notification(
     payload: TeamsNotificationRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> Notification:
-    service = NotificationService(db)
-    application = (
-        db.query(Application)
-        .options(joinedload(Application.project))
-        .filter(Application.id == payload.application_id)
-        .one_or_none()
-    )
+    statement = select(Application).options(selectinload(Application.project)).where(Application.id == payload.application_id)
+    application = (await db.scalars(statement)).one_or_none()
     if not application:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Application introuvable")
 
     summary = payload.summary or f"Alerte obsolescence - {application.name}"
-    return service.send_teams_notification("application", application.id, summary)
+    status_msg = await run_in_threadpool(NotificationService.deliver_teams, summary)
+    return await db.run_sync(
+        lambda session: NotificationService(session).log_notification(
+            "application", application.id, NotificationType.teams, ["teams"], status_msg, summary
+        )
+    )
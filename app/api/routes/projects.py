@@ -2,42 +2,59 @@ from __future__ import annotations
 
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import collection_validator, conditional_response
+from app.api.pagination import PageParams, page_params, paginate
+from app.api.rows import Fields, fields_param, rows_response, select_schema
 from app.api.deps import get_current_user, require_role
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.entities import Project, UserRole
 from app.schemas.entities import Project as ProjectSchema
 from app.schemas.entities import ProjectCreate, ProjectUpdate
+from app.services.dashboard import dashboard_cache
+from app.services.snapshot import DashboardSnapshotService
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
 @router.get("/", response_model=List[ProjectSchema])
 async def list_projects(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Fields = Depends(fields_param(ProjectSchema)),
+    db: AsyncSession = Depends(get_read_db),
     _: None = Depends(get_current_user),
 ) -> List[Project]:
-    return db.query(Project).order_by(Project.name).all()
+    not_modified = conditional_response(
+        request, response, [await collection_validator(db, Project)], page.cursor, page.limit, fields
+    )
+    if not_modified:
+        return not_modified
+    order = [(Project.name, False), (Project.id, False)]
+    statement = select_schema(ProjectSchema, Project, fields, include=[column for column, _ in order])
+    rows = await paginate(db, statement, order, page, response, scalars=False)
+    return rows_response(ProjectSchema, rows, response, fields=fields)
 
 
 @router.post("/", response_model=ProjectSchema, status_code=status.HTTP_201_CREATED)
 async def create_project(
     payload: ProjectCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> Project:
     project = Project(**payload.dict())
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
     return project
 
 
 @router.get("/{project_id}", response_model=ProjectSchema)
-async def get_project(project_id: int, db: Session = Depends(get_db), _: None = Depends(get_current_user)) -> Project:
-    project = db.get(Project, project_id)
+async def get_project(project_id: int, db: AsyncSession = Depends(get_read_db), _: None = Depends(get_current_user)) -> Project:
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Projet introuvable")
     return project
@@ -47,17 +64,18 @@ async def get_project(project_id: int, db: Session = Depends(get_db), _: None =
 async def update_project(
     project_id: int,
     payload: ProjectUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> Project:
-    project = db.get(Project, project_id)
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Projet introuvable")
     for field, value in payload.dict(exclude_unset=True).items():
         setattr(project, field, value)
     db.add(project)
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    dashboard_cache.invalidate()
+    await db.refresh(project)
     return project
 
 
@@ -66,12 +84,14 @@ async def update_project(
 )
 async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.admin)),
 ) -> Response:
-    project = db.get(Project, project_id)
+    project = await db.get(Project, project_id)
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Projet introuvable")
-    db.delete(project)
-    db.commit()
+    await db.run_sync(lambda session: DashboardSnapshotService(session).remove_project(project_id))
+    await db.delete(project)
+    await db.commit()
+    dashboard_cache.invalidate()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -3,10 +3,11 @@ from __future__ import annotations
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import require_role
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.entities import GlobalSetting, UserRole
 from app.schemas.entities import GlobalSetting as GlobalSettingSchema
 from app.schemas.entities import GlobalSettingCreate, GlobalSettingUpdate
@@ -16,22 +17,22 @@ router = APIRouter(prefix="/settings", tags=["settings"])
 
 @router.get("/", response_model=List[GlobalSettingSchema])
 async def list_settings(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     __: None = Depends(require_role(UserRole.admin)),
 ) -> List[GlobalSetting]:
-    return db.query(GlobalSetting).order_by(GlobalSetting.key).all()
+    return (await db.scalars(select(GlobalSetting).order_by(GlobalSetting.key))).all()
 
 
 @router.post("/", response_model=GlobalSettingSchema, status_code=status.HTTP_201_CREATED)
 async def create_setting(
     payload: GlobalSettingCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.admin)),
 ) -> GlobalSetting:
     setting = GlobalSetting(**payload.dict())
     db.add(setting)
-    db.commit()
-    db.refresh(setting)
+    await db.commit()
+    await db.refresh(setting)
     return setting
 
 
@@ -39,17 +40,17 @@ async def create_setting(
 async def update_setting(
     setting_id: int,
     payload: GlobalSettingUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.admin)),
 ) -> GlobalSetting:
-    setting = db.get(GlobalSetting, setting_id)
+    setting = await db.get(GlobalSetting, setting_id)
     if not setting:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Paramètre introuvable")
     for field, value in payload.dict(exclude_unset=True).items():
         setattr(setting, field, value)
     db.add(setting)
-    db.commit()
-    db.refresh(setting)
+    await db.commit()
+    await db.refresh(setting)
     return setting
 
 
@@ -58,12 +59,12 @@ async def update_setting(
 )
 async def delete_setting(
     setting_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.admin)),
 ) -> Response:
-    setting = db.get(GlobalSetting, setting_id)
+    setting = await db.get(GlobalSetting, setting_id)
     if not setting:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Paramètre introuvable")
-    db.delete(setting)
-    db.commit()
+    await db.delete(setting)
+    await db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
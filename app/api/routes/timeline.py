@@ -2,11 +2,14 @@ from __future__ import annotations
 
 from typing import List
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import collection_validator, conditional_response
+from app.api.pagination import PageParams, page_params, paginate
+from app.api.rows import Fields, fields_param, rows_response, select_schema
 from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.core.database import get_read_db
 from app.models.entities import TimelineEvent
 from app.schemas.entities import TimelineEvent as TimelineEventSchema
 
@@ -16,12 +19,19 @@ router = APIRouter(prefix="/timeline", tags=["timeline"])
 @router.get("/", response_model=List[TimelineEventSchema])
 async def list_timeline_events(
     application_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Fields = Depends(fields_param(TimelineEventSchema)),
+    db: AsyncSession = Depends(get_read_db),
     __: None = Depends(get_current_user),
 ) -> List[TimelineEvent]:
-    return (
-        db.query(TimelineEvent)
-        .filter(TimelineEvent.application_id == application_id)
-        .order_by(TimelineEvent.created_at.desc())
-        .all()
-    )
+    validator = await collection_validator(db, TimelineEvent, TimelineEvent.application_id == application_id)
+    not_modified = conditional_response(request, response, [validator], application_id, page.cursor, page.limit, fields)
+    if not_modified:
+        return not_modified
+    order = [(TimelineEvent.created_at, True), (TimelineEvent.id, True)]
+    statement = select_schema(TimelineEventSchema, TimelineEvent, fields, include=[column for column, _ in order])
+    statement = statement.where(TimelineEvent.application_id == application_id)
+    rows = await paginate(db, statement, order, page, response, scalars=False)
+    return rows_response(TimelineEventSchema, rows, response, fields=fields)
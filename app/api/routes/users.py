@@ -3,10 +3,14 @@ from __future__ import annotations
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.pagination import PageParams, page_params, paginate
+from app.api.rows import Fields, fields_param, rows_response, select_schema
 from app.api.deps import require_role
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.entities import User, UserRole
 from app.schemas.entities import User as UserSchema
 from app.schemas.entities import UserCreate, UserUpdate
@@ -17,19 +21,25 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/", response_model=List[UserSchema])
 async def list_users(
-    db: Session = Depends(get_db),
+    response: Response,
+    page: PageParams = Depends(page_params),
+    fields: Fields = Depends(fields_param(UserSchema)),
+    db: AsyncSession = Depends(get_read_db),
     __: None = Depends(require_role(UserRole.admin)),
 ) -> List[User]:
-    return db.query(User).order_by(User.email).all()
+    order = [(User.email, False), (User.id, False)]
+    statement = select_schema(UserSchema, User, fields, include=[column for column, _ in order])
+    rows = await paginate(db, statement, order, page, response, scalars=False)
+    return rows_response(UserSchema, rows, response, fields=fields)
 
 
 @router.post("/", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
 async def create_user(
     payload: UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.admin)),
 ) -> User:
-    existing = db.query(User).filter(User.email == payload.email).one_or_none()
+    existing = (await db.scalars(select(User).where(User.email == payload.email))).one_or_none()
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="E-mail déjà enregistré")
     user = User(
@@ -37,11 +47,11 @@ async def create_user(
         email=payload.email,
         role=payload.role,
         is_active=payload.is_active,
-        password_hash=get_password_hash(payload.password),
+        password_hash=await run_in_threadpool(get_password_hash, payload.password),
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
@@ -49,32 +59,32 @@ async def create_user(
 async def update_user(
     user_id: int,
     payload: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.admin)),
 ) -> User:
-    user = db.get(User, user_id)
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Utilisateur introuvable")
     updates = payload.dict(exclude_unset=True)
     if "password" in updates:
-        user.password_hash = get_password_hash(updates.pop("password"))
+        user.password_hash = await run_in_threadpool(get_password_hash, updates.pop("password"))
     for field, value in updates.items():
         setattr(user, field, value)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
 async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.admin)),
 ) -> Response:
-    user = db.get(User, user_id)
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Utilisateur introuvable")
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,39 +1,50 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, Response, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, require_role
 from app.core.database import get_db
-from app.models.entities import Application, TimelineEvent, UserRole, Version
+from app.models.entities import Application, UserRole, Version
+from app.schemas.bulk import BulkResult, VersionBulkRequest
 from app.schemas.entities import Version as VersionSchema
 from app.schemas.entities import VersionCreate, VersionUpdate
+from app.services.bulk import VERSIONS, BulkInventoryService
+from app.services.dashboard import dashboard_cache
+from app.services.snapshot import DashboardSnapshotService, version_contributions
 
 router = APIRouter(prefix="/versions", tags=["versions"])
 
 
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_versions(
+    payload: VersionBulkRequest,
+    db: AsyncSession = Depends(get_db),
+    __: None = Depends(require_role(UserRole.contributor)),
+) -> BulkResult:
+    """Create, update and delete versions in one transaction, with one result per item."""
+    result = await db.run_sync(lambda session: BulkInventoryService(session).apply(VERSIONS, payload))
+    if result.created or result.updated or result.deleted:
+        dashboard_cache.invalidate()
+    return result
+
+
 @router.post("/", response_model=VersionSchema, status_code=status.HTTP_201_CREATED)
 async def create_version(
     payload: VersionCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> Version:
-    application = db.get(Application, payload.application_id)
+    application = await db.get(Application, payload.application_id)
     if not application:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Application inconnue")
     version = Version(**payload.dict())
     db.add(version)
-    db.commit()
-    db.refresh(version)
-    event = TimelineEvent(
-        application_id=version.application_id,
-        entity_type="version",
-        entity_id=version.id,
-        event_type="create",
-        description=f"Version {version.number} créée",
-    )
-    db.add(event)
-    db.commit()
+    added = version_contributions(version)
+    await db.run_sync(lambda session: DashboardSnapshotService(session).apply(added=added))
+    await db.commit()
+    dashboard_cache.invalidate()
+    await db.refresh(version)
     return version
 
 
@@ -41,26 +52,21 @@ async def create_version(
 async def update_version(
     version_id: int,
     payload: VersionUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> Version:
-    version = db.get(Version, version_id)
+    version = await db.get(Version, version_id)
     if not version:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Version introuvable")
+    previous = version_contributions(version)
     for field, value in payload.dict(exclude_unset=True).items():
         setattr(version, field, value)
     db.add(version)
-    db.commit()
-    db.refresh(version)
-    event = TimelineEvent(
-        application_id=version.application_id,
-        entity_type="version",
-        entity_id=version.id,
-        event_type="update",
-        description=f"Version {version.number} mise à jour",
-    )
-    db.add(event)
-    db.commit()
+    added = version_contributions(version)
+    await db.run_sync(lambda session: DashboardSnapshotService(session).apply(added=added, removed=previous))
+    await db.commit()
+    dashboard_cache.invalidate()
+    await db.refresh(version)
     return version
 
 
@@ -69,23 +75,15 @@ async def update_version(
 )
 async def delete_version(
     version_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     __: None = Depends(require_role(UserRole.contributor)),
 ) -> Response:
-    version = db.get(Version, version_id)
+    version = await db.get(Version, version_id)
     if not version:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Version introuvable")
-    version_number = version.number
-    application_id = version.application_id
-    db.delete(version)
-    db.commit()
-    event = TimelineEvent(
-        application_id=application_id,
-        entity_type="version",
-        entity_id=version_id,
-        event_type="delete",
-        description=f"Version {version_number} supprimée",
-    )
-    db.add(event)
-    db.commit()
+    removed = version_contributions(version)
+    await db.run_sync(lambda session: DashboardSnapshotService(session).apply(removed=removed))
+    await db.delete(version)
+    await db.commit()
+    dashboard_cache.invalidate()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
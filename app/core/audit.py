@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event, insert, inspect
+from sqlalchemy.orm import Session
+
+from app.models.entities import ActionPlan, Application, Comment, Dependency, TimelineEvent, Version
+
+# ``session.info`` key holding ``(user_id, user_name)`` of the authenticated user.
+ACTOR_KEY = "audit_actor"
+# Bookkeeping columns, never reported as changes.
+IGNORED_COLUMNS = {"created_at", "updated_at"}
+
+Actor = Optional[Tuple[int, str]]
+
+
+@dataclass(frozen=True)
+class AuditRule:
+    """How changes of one model are written to the timeline.
+
+    Each description receives the entity, the audited changed column names
+    (updates only) and the actor; ``None`` means the change is not recorded.
+    """
+
+    entity_type: str
+    created: Optional[Callable[[object, Actor], str]] = None
+    updated: Optional[Callable[[object, List[str], Actor], str]] = None
+    deleted: Optional[Callable[[object, Actor], str]] = None
+
+
+def comment_created(comment: Comment, actor: Actor) -> str:
+    return f"Commentaire ajouté par {actor[1]}" if actor else "Commentaire ajouté"
+
+
+AUDIT_RULES: Dict[type, AuditRule] = {
+    Version: AuditRule(
+        "version",
+        created=lambda version, actor: f"Version {version.number} créée",
+        updated=lambda version, changes, actor: f"Version {version.number} mise à jour",
+        deleted=lambda version, actor: f"Version {version.number} supprimée",
+    ),
+    Dependency: AuditRule(
+        "dependency",
+        created=lambda dependency, actor: f"Dépendance {dependency.name} ajoutée",
+        updated=lambda dependency, changes, actor: f"Dépendance {dependency.name} mise à jour",
+        deleted=lambda dependency, actor: f"Dépendance {dependency.name} supprimée",
+    ),
+    ActionPlan: AuditRule(
+        "action_plan",
+        created=lambda plan, actor: f"Plan d'action '{plan.title}' créé",
+        updated=lambda plan, changes, actor: f"Plan d'action '{plan.title}' mis à jour",
+        deleted=lambda plan, actor: f"Plan d'action '{plan.title}' supprimé",
+    ),
+    Comment: AuditRule(
+        "comment",
+        created=comment_created,
+        updated=lambda comment, changes, actor: "Commentaire mis à jour",
+        deleted=lambda comment, actor: "Commentaire supprimé",
+    ),
+    # Creations and deletions of applications are not part of their own timeline.
+    Application: AuditRule(
+        "application",
+        updated=lambda application, changes, actor: ", ".join(f"{field} mis à jour" for field in changes),
+    ),
+}
+
+
+def set_actor(session, user) -> None:
+    """Attribute the timeline events written by ``session`` to ``user``."""
+    session.info[ACTOR_KEY] = (user.id, user.name)
+
+
+def changed_columns(instance) -> List[str]:
+    state = inspect(instance)
+    return [
+        attribute.key
+        for attribute in state.mapper.column_attrs
+        if attribute.key not in IGNORED_COLUMNS and state.attrs[attribute.key].history.has_changes()
+    ]
+
+
+def application_id_of(instance) -> int:
+    return instance.id if isinstance(instance, Application) else instance.application_id
+
+
+def timeline_rows(session: Session) -> List[dict]:
+    """Timeline events for the pending changes of ``session``, in new/dirty/deleted order."""
+    actor: Actor = session.info.get(ACTOR_KEY)
+    # Events of an application's children would reference a row that is being deleted with them.
+    deleted_applications: Set[int] = {
+        instance.id for instance in session.deleted if isinstance(instance, Application)
+    }
+    rows: List[dict] = []
+
+    def record(instance, event_type: str, description: Optional[str]) -> None:
+        application_id = application_id_of(instance)
+        if description is None or application_id in deleted_applications:
+            return
+        rows.append(
+            {
+                "application_id": application_id,
+                "entity_type": AUDIT_RULES[type(instance)].entity_type,
+                "entity_id": instance.id,
+                "event_type": event_type,
+                "description": description,
+                "performed_by_id": actor[0] if actor else None,
+            }
+        )
+
+    for instance in session.new:
+        rule = AUDIT_RULES.get(type(instance))
+        if rule and rule.created:
+            record(instance, "create", rule.created(instance, actor))
+    for instance in session.dirty:
+        rule = AUDIT_RULES.get(type(instance))
+        if not rule or not rule.updated or instance in session.deleted:
+            continue
+        changes = changed_columns(instance)
+        if changes:
+            record(instance, "update", rule.updated(instance, changes, actor))
+    for instance in session.deleted:
+        rule = AUDIT_RULES.get(type(instance))
+        if rule and rule.deleted:
+            record(instance, "delete", rule.deleted(instance, actor))
+    return rows
+
+
+class AuditedSession(Session):
+    """Session writing a timeline event for each audited change, in the transaction of the change.
+
+    Events are collected after each flush, when new rows have their ids and
+    attribute history is still available, and inserted with one statement.
+    Core statements (bulk endpoints, snapshots) bypass the unit of work and
+    write their own events.
+    """
+
+
+@event.listens_for(AuditedSession, "after_flush")
+def write_timeline_events(session: Session, flush_context) -> None:
+    rows = timeline_rows(session)
+    if rows:
+        session.connection().execute(insert(TimelineEvent.__table__), rows)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class TTLCache:
+    """In-process cache with expiry, explicit invalidation and single-flight computation.
+
+    Concurrent misses on the same key share one computation: the first caller
+    computes the value while the others await the same future. Values computed
+    before an ``invalidate()`` call are never stored, so a slow computation
+    cannot repopulate the cache with data older than the last write. When the
+    first caller is cancelled, a waiting caller computes the value instead.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        if self.ttl_seconds <= 0:
+            self.misses += 1
+            return await compute()
+
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                return await self._compute(key, compute)
+            self.coalesced += 1
+            # Unlike awaiting the future, wait() neither cancels it when this caller is cancelled
+            # nor raises when the leader was cancelled: the next loop then computes the value again.
+            await asyncio.wait({pending})
+            if not pending.cancelled():
+                return pending.result()
+
+    async def _compute(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        self.misses += 1
+        generation = self._generation
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            # The cancellation of the leader (e.g. its client went away) is not an error of the computation.
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark the exception as retrieved when nobody else was waiting for it.
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if generation == self._generation:
+                if len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._entries = {}
+        self._inflight = {}
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+        }
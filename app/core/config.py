@@ -14,6 +14,10 @@ class Settings(BaseSettings):
     backend_cors_origins: List[str] = Field(default_factory=list)
 
     database_url: str = Field("sqlite:///./obsolescences.db", env="DATABASE_URL")
+    database_read_url: Optional[str] = Field(None, env="DATABASE_READ_URL")
+    database_read_stickiness_seconds: float = Field(5, env="DATABASE_READ_STICKINESS_SECONDS")
+    database_pool_size: int = Field(5, env="DATABASE_POOL_SIZE")
+    database_slow_query_ms: int = Field(500, env="DATABASE_SLOW_QUERY_MS")
 
     smtp_host: Optional[str] = Field(None, env="SMTP_HOST")
     smtp_port: int = Field(587, env="SMTP_PORT")
@@ -28,6 +32,15 @@ class Settings(BaseSettings):
     alert_warning_months: int = Field(3, env="ALERT_WARNING_MONTHS")
     alert_critical_months: int = Field(1, env="ALERT_CRITICAL_MONTHS")
 
+    dashboard_cache_ttl_seconds: int = Field(60, env="DASHBOARD_CACHE_TTL_SECONDS")
+
+    import_chunk_size: int = Field(5000, env="IMPORT_CHUNK_SIZE")
+    import_validation_workers: int = Field(1, env="IMPORT_VALIDATION_WORKERS")
+    import_directory: str = Field("./imports", env="IMPORT_DIRECTORY")
+    import_workers: int = Field(2, env="IMPORT_WORKERS")
+    import_job_lease_seconds: int = Field(120, env="IMPORT_JOB_LEASE_SECONDS")
+    import_poll_seconds: float = Field(5, env="IMPORT_POLL_SECONDS")
+
     scheduler_timezone: str = Field("Europe/Paris", env="SCHEDULER_TIMEZONE")
     scheduler_enabled: bool = Field(True, env="SCHEDULER_ENABLED")
 
@@ -1,31 +1,164 @@
 from __future__ import annotations
 
+import time
 from contextlib import contextmanager
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
-from sqlalchemy import create_engine
+from fastapi import Depends, Request, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.models.base import Base
 
+from .audit import AuditedSession
 from .config import get_settings
+from .metrics import instrument_engine, timed_pool_class
 
 settings = get_settings()
 
-engine_kwargs: dict = {"future": True, "pool_pre_ping": True}
-if settings.database_url.startswith("sqlite"):
-    engine_kwargs["connect_args"] = {"check_same_thread": False}
+# Applied to every SQLite connection. WAL lets readers proceed while a writer
+# commits; synchronous=NORMAL is durable in WAL mode except on power loss.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "foreign_keys": "ON",
+    "busy_timeout": 5000,
+    "cache_size": -64000,
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+}
+# Meaningless (or refused) for in-memory databases.
+SQLITE_FILE_PRAGMAS = {"journal_mode", "mmap_size"}
+
+
+def is_sqlite_memory(database_url: str) -> bool:
+    database = make_url(database_url).database
+    return not database or database == ":memory:" or database.startswith("file::memory:")
+
+
+def configure_sqlite(engine: Engine, database_url: str, pragmas: dict | None = None) -> None:
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+    if is_sqlite_memory(database_url):
+        pragmas = {name: value for name, value in pragmas.items() if name not in SQLITE_FILE_PRAGMAS}
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def engine_options(database_url: str, asynchronous: bool = False, name: str = "primary") -> dict:
+    options: dict = {"pool_pre_ping": True}
+    if database_url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+        if is_sqlite_memory(database_url):
+            # Keep SQLAlchemy's single-connection pools, an in-memory database lives in its connection.
+            return options
+    # SQLite connections are cheap, but reopening them loses the page cache and mmap.
+    options.update(
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_pool_size,
+        poolclass=timed_pool_class(AsyncAdaptedQueuePool if asynchronous else QueuePool, name),
+    )
+    return options
 
-engine = create_engine(settings.database_url, **engine_kwargs)
+
+engine = create_engine(settings.database_url, future=True, **engine_options(settings.database_url))
+if settings.database_url.startswith("sqlite"):
+    configure_sqlite(engine, settings.database_url)
+instrument_engine(engine, "primary")
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False, class_=Session)
 
+# Async drivers used by the API for each synchronous backend. The synchronous
+# engine above remains in use for the scheduler, scripts and Alembic.
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "mysql": "asyncmy", "mariadb": "asyncmy", "postgresql": "asyncpg"}
+
+
+def async_database_url(database_url: str) -> str:
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None or url.get_driver_name() == driver:
+        return database_url
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+def create_api_engine(database_url: str, name: str):
+    async_url = async_database_url(database_url)
+    api_engine = create_async_engine(async_url, **engine_options(async_url, asynchronous=True, name=name))
+    if database_url.startswith("sqlite"):
+        configure_sqlite(api_engine.sync_engine, database_url)
+    instrument_engine(api_engine.sync_engine, name)
+    return api_engine
+
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+async_engine = create_api_engine(settings.database_url, "api")
+# API sessions record the timeline of the entities they change (see app.core.audit).
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    class_=AsyncSession,
+    sync_session_class=AuditedSession,
+)
+
+
+read_engine = None
+ReadSessionLocal = AsyncSessionLocal
+if settings.database_read_url:
+    read_engine = create_api_engine(settings.database_read_url, "replica")
+    ReadSessionLocal = async_sessionmaker(bind=read_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+
+# Set after a successful mutation so that the same client keeps reading from the
+# primary until the replica has caught up with its own writes.
+READ_PRIMARY_COOKIE = "obs_read_primary_until"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def pinned_to_primary(request: Request) -> bool:
+    """Whether the client wrote recently and must not read from the replica yet."""
+    if read_engine is None:
+        return False
     try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_db(request: Request, db: AsyncSession = Depends(get_db)) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only routes: the replica when configured, unless the client wrote recently.
+
+    Reads served by the primary reuse the request's ``get_db`` session (the one
+    authenticating the user), so that a request never holds two connections of
+    the same pool and bursts cannot deadlock on pool checkout.
+    """
+    if read_engine is None or pinned_to_primary(request):
         yield db
-    finally:
-        db.close()
+        return
+    async with ReadSessionLocal() as read_db:
+        yield read_db
+
+
+def mark_recent_write(request: Request, response: Response) -> None:
+    if read_engine is None or request.method in SAFE_METHODS or response.status_code >= 400:
+        return
+    stickiness = settings.database_read_stickiness_seconds
+    response.set_cookie(
+        READ_PRIMARY_COOKIE,
+        f"{time.time() + stickiness:.3f}",
+        max_age=max(1, int(stickiness + 0.999)),
+        httponly=True,
+        samesite="lax",
+    )
 
 
 @contextmanager
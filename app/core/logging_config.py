@@ -15,6 +15,9 @@ class JsonFormatter(logging.Formatter):
             "message": record.getMessage(),
             "time": self.formatTime(record, self.datefmt),
         }
+        context = getattr(record, "context", None)
+        if isinstance(context, dict):
+            log_entry.update(context)
         if record.exc_info:
             log_entry["exc_info"] = self.formatException(record.exc_info)
         return self.jsonify(log_entry)
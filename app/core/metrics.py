@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import Dict, Optional, Sequence, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+
+from .config import get_settings
+
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+# Upper bounds in seconds, Prometheus style; the last bucket is +Inf.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WAIT_BUCKETS = (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+STATEMENT_PREVIEW_LENGTH = 1000
+
+
+class Histogram:
+    """Cumulative-bucket histogram, safe to update from several threads."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative, buckets = 0, {}
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"count": cumulative, "sum": round(total, 6), "buckets": buckets}
+
+
+class EngineMetrics:
+    def __init__(self) -> None:
+        self.checkout_wait = Histogram(WAIT_BUCKETS)
+        self.statement_latency = Histogram(LATENCY_BUCKETS)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.statements = 0
+        self.statement_errors = 0
+        self.slow_statements = 0
+        self.max_checked_out = 0
+        self.pool: Optional[Pool] = None
+        self._lock = threading.Lock()
+
+    def pool_usage(self) -> dict:
+        pool = self.pool
+        if not isinstance(pool, QueuePool):
+            return {"class": type(pool).__name__ if pool else None}
+        return {
+            "class": type(pool).__name__,
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            # Negative while the pool has not opened all of its permanent connections yet.
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "max_checked_out": self.max_checked_out,
+        }
+
+    def snapshot(self) -> dict:
+        return {
+            "pool": self.pool_usage(),
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+            "statements": self.statements,
+            "statement_errors": self.statement_errors,
+            "slow_statements": self.slow_statements,
+            "statement_seconds": self.statement_latency.snapshot(),
+        }
+
+
+class DatabaseMetrics:
+    """Pool and statement metrics of every engine, keyed by engine name."""
+
+    def __init__(self) -> None:
+        self.engines: Dict[str, EngineMetrics] = {}
+
+    def engine(self, name: str) -> EngineMetrics:
+        return self.engines.setdefault(name, EngineMetrics())
+
+    def snapshot(self) -> Dict[str, dict]:
+        return {name: metrics.snapshot() for name, metrics in self.engines.items()}
+
+
+database_metrics = DatabaseMetrics()
+
+
+class TimedCheckoutMixin:
+    """Measures how long ``Pool.connect`` waits for a connection, including pool saturation."""
+
+    metrics_name = "default"
+
+    def _do_get(self):
+        metrics = database_metrics.engine(self.metrics_name)
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with metrics._lock:
+                metrics.checkout_timeouts += 1
+            raise
+        finally:
+            metrics.checkout_wait.observe(time.perf_counter() - started)
+
+
+def timed_pool_class(pool_class: Type[Pool], name: str) -> Type[Pool]:
+    # A subclass per engine rather than an attribute: Pool.recreate() (engine.dispose())
+    # builds the new pool from self.__class__.
+    return type(f"Timed{pool_class.__name__}", (TimedCheckoutMixin, pool_class), {"metrics_name": name})
+
+
+def fingerprint(parameters) -> str:
+    """Stable digest of the bound parameters: groups executions without logging their values."""
+    return hashlib.sha1(repr(parameters).encode("utf-8")).hexdigest()[:16]
+
+
+def _statement_preview(statement: str) -> str:
+    return re.sub(r"\s+", " ", statement).strip()[:STATEMENT_PREVIEW_LENGTH]
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Record pool usage and statement latency of ``engine``; log statements slower than the threshold."""
+    metrics = database_metrics.engine(name)
+    metrics.pool = engine.pool
+    threshold = get_settings().database_slow_query_ms / 1000
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(_dbapi_connection, _connection_record, _connection_proxy) -> None:
+        pool = engine.pool
+        metrics.pool = pool
+        with metrics._lock:
+            metrics.checkouts += 1
+            if isinstance(pool, QueuePool):
+                metrics.max_checked_out = max(metrics.max_checked_out, pool.checkedout())
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def on_before_execute(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def on_after_execute(conn, _cursor, statement, parameters, _context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info["statement_started"].pop()
+        metrics.statement_latency.observe(elapsed)
+        with metrics._lock:
+            metrics.statements += 1
+            if threshold > 0 and elapsed >= threshold:
+                metrics.slow_statements += 1
+        if threshold > 0 and elapsed >= threshold:
+            slow_query_logger.warning(
+                "Requête SQL lente (%.0f ms)",
+                elapsed * 1000,
+                extra={
+                    "context": {
+                        "engine": name,
+                        "duration_ms": round(elapsed * 1000, 1),
+                        "statement": _statement_preview(statement),
+                        "parameters_fingerprint": fingerprint(parameters),
+                        "executemany": executemany,
+                    }
+                },
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def on_error(exception_context) -> None:
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("statement_started"):
+            connection.info["statement_started"].pop()
+        with metrics._lock:
+            metrics.statement_errors += 1
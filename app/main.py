@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import logging
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.api.routes import (
     action_plans,
     applications,
@@ -16,6 +18,7 @@ from app.api.routes import (
     dashboard,
     dependencies,
     import_export,
+    metrics,
     notifications,
     projects,
     settings,
@@ -24,9 +27,10 @@ from app.api.routes import (
     versions,
 )
 from app.core.config import get_settings
-from app.core.database import Base, engine
+from app.core.database import Base, async_engine, engine, mark_recent_write, read_engine
 from app.core.logging_config import configure_logging
-from app.tasks.scheduler import start_scheduler
+from app.tasks.imports import import_workers, start_import_workers
+from app.tasks.scheduler import initialize_dashboard_snapshot, start_scheduler
 
 configure_logging()
 logger = logging.getLogger(__name__)
@@ -43,8 +47,17 @@ if app_settings.backend_cors_origins:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    mark_recent_write(request, response)
+    return response
+
+
 app.include_router(auth.router, prefix=app_settings.api_v1_str)
 app.include_router(projects.router, prefix=app_settings.api_v1_str)
 app.include_router(applications.router, prefix=app_settings.api_v1_str)
@@ -59,6 +72,7 @@ app.include_router(import_export.router, prefix=app_settings.api_v1_str)
 app.include_router(catalog.router, prefix=app_settings.api_v1_str)
 app.include_router(settings.router, prefix=app_settings.api_v1_str)
 app.include_router(users.router, prefix=app_settings.api_v1_str)
+app.include_router(metrics.router, prefix=app_settings.api_v1_str)
 
 app.mount("/static", StaticFiles(directory="frontend/static"), name="static")
 
@@ -68,9 +82,19 @@ start_scheduler(app)
 @app.on_event("startup")
 async def on_startup() -> None:  # pragma: no cover - initialization
     Base.metadata.create_all(bind=engine)
+    await run_in_threadpool(initialize_dashboard_snapshot)
+    start_import_workers()
     logger.info("Application démarrée")
 
 
+@app.on_event("shutdown")
+async def on_shutdown() -> None:  # pragma: no cover - teardown
+    import_workers.stop()
+    await async_engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+
+
 @app.get("/", response_class=HTMLResponse)
 async def index() -> HTMLResponse:
     index_path = "frontend/templates/index.html"
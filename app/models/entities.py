@@ -4,7 +4,7 @@ from datetime import date, datetime, timezone
 from enum import Enum
 from typing import List, Optional
 
-from sqlalchemy import Date, DateTime, Enum as SQLEnum, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Date, DateTime, Enum as SQLEnum, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
@@ -49,6 +49,10 @@ class ApplicationStatus(str, Enum):
 
 class Application(TimestampMixin, Base):
     __tablename__ = "applications"
+    __table_args__ = (
+        Index("ix_applications_project_id_criticity", "project_id", "criticity"),
+        Index("ix_applications_name", "name"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -70,6 +74,10 @@ class Application(TimestampMixin, Base):
 
 class Version(TimestampMixin, Base):
     __tablename__ = "versions"
+    __table_args__ = (
+        Index("ix_versions_application_id_end_of_support", "application_id", "end_of_support"),
+        Index("ix_versions_end_of_support", "end_of_support"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     application_id: Mapped[int] = mapped_column(ForeignKey("applications.id", ondelete="CASCADE"), nullable=False)
@@ -96,6 +104,12 @@ class DependencyCategory(str, Enum):
 
 class Dependency(TimestampMixin, Base):
     __tablename__ = "dependencies"
+    __table_args__ = (
+        Index("ix_dependencies_application_id_end_of_support", "application_id", "end_of_support"),
+        Index("ix_dependencies_name_end_of_support", "name", "end_of_support"),
+        Index("ix_dependencies_normalized_name", "normalized_name"),
+        Index("ix_dependencies_end_of_support", "end_of_support"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     application_id: Mapped[int] = mapped_column(ForeignKey("applications.id", ondelete="CASCADE"), nullable=False)
@@ -116,6 +130,7 @@ class NotificationType(str, Enum):
 
 class Notification(TimestampMixin, Base):
     __tablename__ = "notifications"
+    __table_args__ = (Index("ix_notifications_sent_at", "sent_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     target_type: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -162,6 +177,10 @@ class ActionPlanStatus(str, Enum):
 
 class ActionPlan(TimestampMixin, Base):
     __tablename__ = "action_plans"
+    __table_args__ = (
+        Index("ix_action_plans_due_date", "due_date"),
+        Index("ix_action_plans_application_id_due_date", "application_id", "due_date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     application_id: Mapped[int] = mapped_column(ForeignKey("applications.id", ondelete="CASCADE"), nullable=False)
@@ -179,6 +198,7 @@ class ActionPlan(TimestampMixin, Base):
 
 class Comment(TimestampMixin, Base):
     __tablename__ = "comments"
+    __table_args__ = (Index("ix_comments_application_id_created_at", "application_id", "created_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     application_id: Mapped[int] = mapped_column(ForeignKey("applications.id", ondelete="CASCADE"), nullable=False)
@@ -192,6 +212,7 @@ class Comment(TimestampMixin, Base):
 
 class TimelineEvent(TimestampMixin, Base):
     __tablename__ = "timeline_events"
+    __table_args__ = (Index("ix_timeline_events_application_id_created_at", "application_id", "created_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     application_id: Mapped[int] = mapped_column(ForeignKey("applications.id", ondelete="CASCADE"), nullable=False)
@@ -222,3 +243,64 @@ class CorrectiveAction(TimestampMixin, Base):
     reference: Mapped[Optional[str]] = mapped_column(String(255))
 
     application: Mapped[Application] = relationship("Application")
+
+
+class DashboardSnapshot(TimestampMixin, Base):
+    __tablename__ = "dashboard_snapshot"
+    __table_args__ = (UniqueConstraint("metric", "key", name="uq_dashboard_snapshot_metric_key"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    metric: Mapped[str] = mapped_column(String(50), nullable=False)
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class DashboardHistory(TimestampMixin, Base):
+    __tablename__ = "dashboard_history"
+    __table_args__ = (
+        UniqueConstraint("day", "project_id", name="uq_dashboard_history_day_project"),
+        Index("ix_dashboard_history_project_id_day", "project_id", "day"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    total_items: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    obsolete_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    expiring_3_months: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    expiring_6_months: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    expiring_later: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    not_planned_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    planned_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    in_progress_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    done_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class ImportJobStatus(str, Enum):
+    queued = "en_attente"
+    running = "en_cours"
+    succeeded = "termine"
+    failed = "echoue"
+
+
+class ImportJob(TimestampMixin, Base):
+    __tablename__ = "import_jobs"
+    __table_args__ = (Index("ix_import_jobs_status_heartbeat_at", "status", "heartbeat_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    path: Mapped[str] = mapped_column(String(500), nullable=False)
+    status: Mapped[ImportJobStatus] = mapped_column(
+        SQLEnum(ImportJobStatus), default=ImportJobStatus.queued, nullable=False
+    )
+    rows_processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    projects_created: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    applications_created: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    versions_created: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    dependencies_created: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    errors: Mapped[List[str]] = mapped_column(JSON, default=list, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    created_by_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from app.schemas.entities import DependencyCreate, DependencyUpdate, VersionCreate, VersionUpdate
+
+MAX_BULK_ITEMS = 5000
+
+
+class VersionBulkUpdate(VersionUpdate):
+    id: int
+
+
+class DependencyBulkUpdate(DependencyUpdate):
+    id: int
+
+
+class VersionBulkRequest(BaseModel):
+    create: List[VersionCreate] = Field(default_factory=list)
+    update: List[VersionBulkUpdate] = Field(default_factory=list)
+    delete: List[int] = Field(default_factory=list)
+
+
+class DependencyBulkRequest(BaseModel):
+    create: List[DependencyCreate] = Field(default_factory=list)
+    update: List[DependencyBulkUpdate] = Field(default_factory=list)
+    delete: List[int] = Field(default_factory=list)
+
+
+class BulkItemResult(BaseModel):
+    action: Literal["create", "update", "delete"]
+    index: int
+    id: Optional[int]
+    ok: bool
+    detail: Optional[str]
+
+
+class BulkResult(BaseModel):
+    created: int
+    updated: int
+    deleted: int
+    errors: int
+    items: List[BulkItemResult]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -29,6 +29,32 @@ class DependencyAlert(BaseModel):
     urgency_color: str
 
 
+class HistogramSeries(BaseModel):
+    name: str
+    counts: List[int]
+
+
+class DeadlineHistogram(BaseModel):
+    granularity: str
+    split_by: Optional[str]
+    periods: List[str]
+    series: List[HistogramSeries]
+
+
+class DashboardHistoryPoint(BaseModel):
+    period: str
+    day: date
+    total_items: int
+    obsolete_count: int
+    expiring_3_months: int
+    expiring_6_months: int
+    expiring_later: int
+    not_planned_count: int
+    planned_count: int
+    in_progress_count: int
+    done_count: int
+
+
 class DashboardMetrics(BaseModel):
     total_items: int
     obsolete_count: int
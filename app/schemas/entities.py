@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import date, datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, validator
 
 from app.models.entities import (
     ActionPlanStatus,
@@ -133,6 +133,11 @@ class Dependency(DependencyBase, TimestampMixin):
     id: int
 
 
+def split_recipients(value: str) -> List[str]:
+    """Recipients are stored as the comma separated list of the e-mail ``To`` header."""
+    return [recipient.strip() for recipient in value.split(",") if recipient.strip()]
+
+
 class NotificationBase(BaseModel):
     target_type: str
     target_id: int
@@ -141,6 +146,10 @@ class NotificationBase(BaseModel):
     status: str
     message: Optional[str]
 
+    @validator("recipients", pre=True)
+    def parse_recipients(cls, value):  # noqa: N805
+        return split_recipients(value) if isinstance(value, str) else value
+
 
 class NotificationCreate(NotificationBase):
     pass
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, validator
+
+from app.models.entities import ImportJobStatus
+from app.schemas.entities import TimestampMixin
+
+
+class ImportJob(TimestampMixin):
+    id: int
+    filename: str
+    status: ImportJobStatus
+    rows_processed: int
+    projects_created: int
+    applications_created: int
+    versions_created: int
+    dependencies_created: int
+    errors: List[str]
+    attempts: int
+    started_at: Optional[datetime]
+    heartbeat_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    # Rows per second since the job started, up to its last committed chunk.
+    throughput: Optional[float] = None
+
+    @validator("throughput", always=True)
+    def compute_throughput(cls, value: Optional[float], values: dict) -> Optional[float]:
+        started_at, last_progress = values.get("started_at"), values.get("heartbeat_at")
+        if not started_at or not last_progress:
+            return None
+        elapsed = (last_progress - started_at).total_seconds()
+        return round(values["rows_processed"] / elapsed, 1) if elapsed > 0 else None
+
+
+class ImportPreviewEntity(BaseModel):
+    created: int
+    skipped: int
+    # Existing keys whose values differ in the file: the import keeps the stored values.
+    differing: int
+    samples: Dict[str, List[Dict[str, Any]]]
+
+
+class ImportPreview(BaseModel):
+    rows: int
+    rows_created: int
+    rows_skipped: int
+    rows_rejected: int
+    # Valid rows after the first faulty one, at ``stopped_at_line``: the import does not write them.
+    rows_ignored: int
+    stopped_at_line: Optional[int]
+    errors: List[str]
+    projects: ImportPreviewEntity
+    applications: ImportPreviewEntity
+    versions: ImportPreviewEntity
+    dependencies: ImportPreviewEntity
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.audit import ACTOR_KEY
+from app.models.entities import Application, Dependency, TechnologyLifecycle, TimelineEvent, Version
+from app.schemas.bulk import MAX_BULK_ITEMS, BulkItemResult, BulkResult
+from app.services.snapshot import DashboardSnapshotService, dependency_contributions, version_contributions
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_dependency_names(db: Session, rows: List[dict]) -> None:
+    """Fill ``normalized_name`` from the catalog, like the single create endpoint, with one query."""
+    names = {row["name"].lower() for row in rows if not row.get("normalized_name") and row.get("name")}
+    if not names:
+        return
+    statement = select(TechnologyLifecycle.name).where(func.lower(TechnologyLifecycle.name).in_(names))
+    catalog = {name.lower(): name for name in db.scalars(statement)}
+    for row in rows:
+        if not row.get("normalized_name") and row.get("name"):
+            row["normalized_name"] = catalog.get(row["name"].lower(), row.get("normalized_name"))
+
+
+@dataclass(frozen=True)
+class BulkTarget:
+    model: type
+    entity_type: str
+    label: str
+    contributions: Callable[[object], Counter]
+    created: str
+    updated: str
+    deleted: str
+    not_found: str
+    prepare: Optional[Callable[[Session, List[dict]], None]] = None
+
+
+VERSIONS = BulkTarget(
+    model=Version,
+    entity_type="version",
+    label="number",
+    contributions=version_contributions,
+    created="Version {} créée",
+    updated="Version {} mise à jour",
+    deleted="Version {} supprimée",
+    not_found="Version introuvable",
+)
+DEPENDENCIES = BulkTarget(
+    model=Dependency,
+    entity_type="dependency",
+    label="name",
+    contributions=dependency_contributions,
+    created="Dépendance {} ajoutée",
+    updated="Dépendance {} mise à jour",
+    deleted="Dépendance {} supprimée",
+    not_found="Dépendance introuvable",
+    prepare=normalize_dependency_names,
+)
+
+
+class BulkInventoryService:
+    """Apply a batch of creations, updates and deletions in one transaction.
+
+    References are checked with one query per kind, rows are written with
+    executemany statements and the timeline events are inserted together.
+    Invalid items are reported and skipped, the others are applied. Updates
+    that change nothing are reported without writing or logging anything.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply(self, target: BulkTarget, payload) -> BulkResult:
+        if len(payload.create) + len(payload.update) + len(payload.delete) > MAX_BULK_ITEMS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Trop d'éléments dans le lot (maximum {MAX_BULK_ITEMS})",
+            )
+        model = target.model
+        results: List[BulkItemResult] = []
+
+        def fail(action: str, index: int, item_id: Optional[int], detail: str) -> None:
+            results.append(BulkItemResult(action=action, index=index, id=item_id, ok=False, detail=detail))
+
+        creates = [item.dict() for item in payload.create]
+        updates = [item.dict(exclude_unset=True) for item in payload.update]
+        application_ids = {row["application_id"] for row in creates}
+        application_ids |= {row["application_id"] for row in updates if row.get("application_id") is not None}
+        known_applications: Set[int] = set()
+        if application_ids:
+            statement = select(Application.id).where(Application.id.in_(application_ids))
+            known_applications = set(self.db.scalars(statement))
+        target_ids = {row["id"] for row in updates} | set(payload.delete)
+        existing: Dict[int, dict] = {}
+        if target_ids:
+            statement = select(model.__table__).where(model.id.in_(target_ids))
+            existing = {row["id"]: dict(row) for row in self.db.execute(statement).mappings()}
+
+        valid_creates: List[Tuple[int, dict]] = []
+        for index, row in enumerate(creates):
+            if row["application_id"] not in known_applications:
+                fail("create", index, None, "Application inconnue")
+            else:
+                valid_creates.append((index, row))
+
+        required = {column.name for column in model.__table__.columns if not column.nullable}
+        seen: Set[int] = set()
+        valid_updates: List[Tuple[int, dict]] = []
+        for index, row in enumerate(updates):
+            item_id = row["id"]
+            missing = sorted(field for field, value in row.items() if value is None and field in required)
+            if item_id in seen:
+                fail("update", index, item_id, "Élément présent plusieurs fois dans le lot")
+            elif item_id not in existing:
+                fail("update", index, item_id, target.not_found)
+            elif missing:
+                fail("update", index, item_id, f"Valeur obligatoire : {', '.join(missing)}")
+            elif "application_id" in row and row["application_id"] not in known_applications:
+                fail("update", index, item_id, "Application inconnue")
+            else:
+                # Only the fields whose value differs are written.
+                before = existing[item_id]
+                changes = {field: value for field, value in row.items() if field != "id" and before[field] != value}
+                if changes:
+                    valid_updates.append((index, {"id": item_id, **changes}))
+                else:
+                    results.append(
+                        BulkItemResult(action="update", index=index, id=item_id, ok=True, detail="Aucune modification")
+                    )
+            seen.add(item_id)
+
+        valid_deletes: List[Tuple[int, int]] = []
+        for index, item_id in enumerate(payload.delete):
+            if item_id in seen:
+                fail("delete", index, item_id, "Élément présent plusieurs fois dans le lot")
+            elif item_id not in existing:
+                fail("delete", index, item_id, target.not_found)
+            else:
+                valid_deletes.append((index, item_id))
+            seen.add(item_id)
+
+        added: Counter = Counter()
+        removed: Counter = Counter()
+        events: List[dict] = []
+        actor = self.db.info.get(ACTOR_KEY)
+
+        def event(row: dict, event_type: str, template: str) -> dict:
+            return {
+                "application_id": row["application_id"],
+                "entity_type": target.entity_type,
+                "entity_id": row["id"],
+                "event_type": event_type,
+                "description": template.format(row[target.label]),
+                "performed_by_id": actor[0] if actor else None,
+            }
+
+        if valid_creates:
+            rows = [row for _, row in valid_creates]
+            if target.prepare:
+                target.prepare(self.db, rows)
+            statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+            created_ids = self.db.scalars(statement, rows).all()
+            for (index, row), item_id in zip(valid_creates, created_ids):
+                row["id"] = item_id
+                added.update(target.contributions(SimpleNamespace(**row)))
+                events.append(event(row, "create", target.created))
+                results.append(BulkItemResult(action="create", index=index, id=item_id, ok=True))
+
+        if valid_updates:
+            self.db.execute(update(model), [row for _, row in valid_updates])
+            for index, row in valid_updates:
+                before = existing[row["id"]]
+                after = {**before, **row}
+                removed.update(target.contributions(SimpleNamespace(**before)))
+                added.update(target.contributions(SimpleNamespace(**after)))
+                events.append(event(after, "update", target.updated))
+                results.append(BulkItemResult(action="update", index=index, id=row["id"], ok=True))
+
+        if valid_deletes:
+            self.db.execute(delete(model).where(model.id.in_([item_id for _, item_id in valid_deletes])))
+            for index, item_id in valid_deletes:
+                removed.update(target.contributions(SimpleNamespace(**existing[item_id])))
+                events.append(event(existing[item_id], "delete", target.deleted))
+                results.append(BulkItemResult(action="delete", index=index, id=item_id, ok=True))
+
+        if events:
+            self.db.execute(insert(TimelineEvent), events)
+        DashboardSnapshotService(self.db).apply(added=added, removed=removed)
+        self.db.commit()
+
+        errors = sum(not result.ok for result in results)
+        logger.info(
+            "Lot %s appliqué : %s créations, %s mises à jour, %s suppressions, %s erreurs",
+            target.entity_type,
+            len(valid_creates),
+            len(valid_updates),
+            len(valid_deletes),
+            errors,
+        )
+        order = {"create": 0, "update": 1, "delete": 2}
+        results.sort(key=lambda result: (order[result.action], result.index))
+        return BulkResult(
+            created=len(valid_creates),
+            updated=len(valid_updates),
+            deleted=len(valid_deletes),
+            errors=errors,
+            items=results,
+        )
@@ -1,20 +1,100 @@
 from __future__ import annotations
 
-from collections import Counter, defaultdict
+from collections import Counter
 from datetime import date
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from sqlalchemy import and_, case, delete, exists, extract, func, insert, literal, null, or_, select, text, union_all
+from sqlalchemy.orm import Session, aliased
 
+from app.core.cache import TTLCache
+from app.core.config import get_settings
 from app.models.entities import (
     Application,
+    CriticityLevel,
+    DashboardHistory,
     Dependency,
     Project,
     RemediationStatus,
     Version,
 )
-from app.schemas.dashboard import DashboardMetrics, DependencyAlert, ProjectCriticityStat, RemediationStats
+from app.schemas.dashboard import (
+    DashboardHistoryPoint,
+    DashboardMetrics,
+    DeadlineHistogram,
+    DependencyAlert,
+    HistogramSeries,
+    ProjectCriticityStat,
+    RemediationStats,
+)
+from app.schemas.filters import DashboardFilter
+from app.services.snapshot import DashboardSnapshotService
+
+settings = get_settings()
+
+# Cached /dashboard/metrics responses, keyed by filter parameters and
+# invalidated by every route that changes the inventory.
+dashboard_cache = TTLCache(settings.dashboard_cache_ttl_seconds)
+
+SHARED_BY_SEPARATOR = "\x1f"
+# DashboardHistory column -> key of the counters computed by ``_counter_columns``.
+HISTORY_COLUMNS = {
+    "total_items": "total_items",
+    "obsolete_count": "obsolete",
+    "expiring_3_months": "within_3_months",
+    "expiring_6_months": "within_6_months",
+    "expiring_later": "later",
+    "not_planned_count": RemediationStatus.not_planned.name,
+    "planned_count": RemediationStatus.planned.name,
+    "in_progress_count": RemediationStatus.in_progress.name,
+    "done_count": RemediationStatus.done.name,
+}
+
+CRITICITY_WEIGHTS = {
+    CriticityLevel.critical: 4,
+    CriticityLevel.high: 3,
+    CriticityLevel.medium: 2,
+    CriticityLevel.low: 1,
+}
+REMEDIATION_WEIGHTS = {
+    RemediationStatus.not_planned: 4,
+    RemediationStatus.planned: 3,
+    RemediationStatus.in_progress: 2,
+    RemediationStatus.done: 1,
+}
+ITEM_TYPES = ("version", "dependency")
+URGENCY_COLORS = {"< 3 mois": "red", "3-6 mois": "orange", "> 6 mois": "green", "Obsolète": "red"}
+
+
+def _month_index(column):
+    return extract("year", column) * 12 + extract("month", column)
+
+
+def _technology_match(dependency, technology: str):
+    return or_(dependency.name == technology, dependency.normalized_name == technology)
+
+
+def _period_columns(column, granularity: str) -> list:
+    year = extract("year", column)
+    if granularity == "year":
+        return [year]
+    month = extract("month", column)
+    if granularity == "month":
+        return [year, month]
+    return [year, case((month <= 3, 1), (month <= 6, 2), (month <= 9, 3), else_=4)]
+
+
+def _period_label(granularity: str, year, part=None) -> str:
+    if granularity == "year":
+        return str(int(year))
+    if granularity == "month":
+        return f"{int(year)}-{int(part):02d}"
+    return f"{int(year)}-T{int(part)}"
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
 
 
 class DashboardService:
@@ -34,109 +114,389 @@ class DashboardService:
             return "3-6 mois"
         return "> 6 mois"
 
-    def get_metrics(self) -> DashboardMetrics:
-        today = date.today()
-        total_versions = self.db.query(func.count(Version.id)).scalar() or 0
-        total_dependencies = self.db.query(func.count(Dependency.id)).scalar() or 0
-        total_items = total_versions + total_dependencies
+    def _application_criteria(self, filters: Optional[DashboardFilter]) -> list:
+        """Criteria on ``Application`` shared by every dashboard metric."""
+        criteria: list = []
+        if filters is None:
+            return criteria
+        if filters.project_id:
+            criteria.append(Application.project_id == filters.project_id)
+        if filters.criticity:
+            try:
+                criteria.append(Application.criticity == CriticityLevel(filters.criticity))
+            except ValueError:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Criticité inconnue")
+        return criteria
+
+    def _item_criteria(self, model, filters: Optional[DashboardFilter]) -> list:
+        """Criteria restricting ``Version`` or ``Dependency`` rows joined to their application."""
+        criteria = self._application_criteria(filters)
+        if filters is None:
+            return criteria
+        if filters.technology:
+            if model is Dependency:
+                criteria.append(_technology_match(Dependency, filters.technology))
+            else:
+                used = aliased(Dependency)
+                criteria.append(
+                    exists().where(used.application_id == Application.id, _technology_match(used, filters.technology))
+                )
+        if filters.deadline_before:
+            criteria.append(model.end_of_support <= filters.deadline_before)
+        return criteria
 
-        obsolete_versions = (
-            self.db.query(Version).filter(Version.end_of_support.isnot(None), Version.end_of_support < today).count()
+    def _inventory_items(self, filters: Optional[DashboardFilter] = None, item_types: Sequence[str] = ITEM_TYPES):
+        versions = (
+            select(
+                literal("version").label("item_type"),
+                Application.project_id.label("project_id"),
+                Application.criticity.label("criticity"),
+                Version.end_of_support.label("end_of_support"),
+                Version.remediation_status.label("remediation_status"),
+            )
+            .join(Application, Version.application_id == Application.id)
+            .where(*self._item_criteria(Version, filters))
         )
-        obsolete_dependencies = (
-            self.db.query(Dependency)
-            .filter(Dependency.end_of_support.isnot(None), Dependency.end_of_support < today)
-            .count()
+        dependencies = (
+            select(
+                literal("dependency").label("item_type"),
+                Application.project_id.label("project_id"),
+                Application.criticity.label("criticity"),
+                Dependency.end_of_support.label("end_of_support"),
+                null().label("remediation_status"),
+            )
+            .join(Application, Dependency.application_id == Application.id)
+            .where(*self._item_criteria(Dependency, filters))
         )
-        obsolete_count = obsolete_versions + obsolete_dependencies
+        selects = [
+            statement for item_type, statement in zip(ITEM_TYPES, (versions, dependencies)) if item_type in item_types
+        ]
+        if len(selects) == 1:
+            return selects[0].subquery("items")
+        return union_all(*selects).subquery("items")
 
-        expiring_counter = Counter({"< 3 mois": 0, "3-6 mois": 0, "> 6 mois": 0, "Obsolète": 0})
+    def _counter_columns(self, items, today: date) -> list:
+        end_of_support = items.c.end_of_support
+        # Same month arithmetic as ``_deadline_bucket``, evaluated by the database.
+        delta_months = _month_index(end_of_support) - (today.year * 12 + today.month)
+        dated = end_of_support.isnot(None)
+        return [
+            func.count().label("total_items"),
+            _count_if(and_(dated, end_of_support < today)).label("obsolete"),
+            _count_if(and_(dated, delta_months.between(1, 3))).label("within_3_months"),
+            _count_if(and_(dated, delta_months.between(4, 6))).label("within_6_months"),
+            _count_if(and_(dated, delta_months > 6)).label("later"),
+            *[
+                _count_if(items.c.remediation_status == remediation_status).label(remediation_status.name)
+                for remediation_status in RemediationStatus
+            ],
+        ]
 
-        for version in self.db.query(Version).filter(Version.end_of_support.isnot(None)).all():
-            bucket = self._deadline_bucket(version.end_of_support)
-            expiring_counter[bucket] += 1
-        for dependency in self.db.query(Dependency).filter(Dependency.end_of_support.isnot(None)).all():
-            bucket = self._deadline_bucket(dependency.end_of_support)
-            expiring_counter[bucket] += 1
+    def _inventory_counters(self, today: date, filters: Optional[DashboardFilter] = None) -> dict[str, int]:
+        items = self._inventory_items(filters)
+        statement = select(*self._counter_columns(items, today))
+        return {key: int(value or 0) for key, value in self.db.execute(statement).one()._mapping.items()}
 
-        expiring_counter["Obsolète"] = obsolete_count
+    def project_counters(self, today: date) -> Dict[int, dict[str, int]]:
+        """Dashboard counters of every project, computed in one grouped statement."""
+        items = self._inventory_items()
+        statement = select(items.c.project_id, *self._counter_columns(items, today)).group_by(items.c.project_id)
+        return {
+            row.project_id: {key: int(value or 0) for key, value in row._mapping.items() if key != "project_id"}
+            for row in self.db.execute(statement)
+        }
 
-        remediation_stats = [
-            RemediationStats(status=status.value, count=self.db.query(Version).filter(Version.remediation_status == status).count())
-            for status in RemediationStatus
+    def record_history(self, today: date) -> int:
+        """Store today's counters per project, replacing any earlier capture of the same day."""
+        rows = [
+            {"day": today, "project_id": project_id, **{column: counters[key] for column, key in HISTORY_COLUMNS.items()}}
+            for project_id, counters in self.project_counters(today).items()
         ]
+        self.db.execute(delete(DashboardHistory).where(DashboardHistory.day == today))
+        if rows:
+            self.db.execute(insert(DashboardHistory), rows)
+        return len(rows)
+
+    def history(
+        self,
+        start: date,
+        end: date,
+        granularity: str = "day",
+        project_id: Optional[int] = None,
+    ) -> List[DashboardHistoryPoint]:
+        """Daily captures between two dates, downsampled to the last capture of each week or month."""
+        columns = [getattr(DashboardHistory, column) for column in HISTORY_COLUMNS]
+        statement = (
+            select(DashboardHistory.day, *[func.sum(column).label(column.key) for column in columns])
+            .where(DashboardHistory.day.between(start, end))
+            .group_by(DashboardHistory.day)
+            .order_by(DashboardHistory.day)
+        )
+        if project_id:
+            statement = statement.where(DashboardHistory.project_id == project_id)
+
+        points: Dict[str, DashboardHistoryPoint] = {}
+        for row in self.db.execute(statement):
+            if granularity == "week":
+                iso_year, iso_week, _ = row.day.isocalendar()
+                period = f"{iso_year}-S{iso_week:02d}"
+            elif granularity == "month":
+                period = f"{row.day.year}-{row.day.month:02d}"
+            else:
+                period = row.day.isoformat()
+            # Counters are levels, not flows: a period is represented by its latest capture.
+            points[period] = DashboardHistoryPoint(
+                period=period, day=row.day, **{column: int(row._mapping[column] or 0) for column in HISTORY_COLUMNS}
+            )
+        return list(points.values())
+
+    def _histogram_counts(
+        self,
+        granularity: str = "quarter",
+        split_by: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        item_types: Sequence[str] = ITEM_TYPES,
+        filters: Optional[DashboardFilter] = None,
+    ) -> Dict[Tuple[str, str], int]:
+        """Count end-of-support dates per (period, series), grouped by the database."""
+        items = self._inventory_items(filters, item_types)
+        end_of_support = items.c.end_of_support
+        periods = _period_columns(end_of_support, granularity)
+        criteria = [end_of_support.isnot(None)]
+        if start:
+            criteria.append(end_of_support >= start)
+        if end:
+            criteria.append(end_of_support <= end)
 
-        timeline_histogram: Dict[str, int] = {}
-        for version in self.db.query(Version).filter(Version.end_of_support.isnot(None)).all():
-            eos = version.end_of_support
-            period = f"{eos.year}-T{((eos.month - 1) // 3) + 1}"
-            timeline_histogram[period] = timeline_histogram.get(period, 0) + 1
+        split_columns: list = []
+        if split_by == "type":
+            split_columns = [items.c.item_type]
+        elif split_by == "criticity":
+            split_columns = [items.c.criticity]
+        elif split_by == "project":
+            split_columns = [Project.id, Project.name]
+        statement = select(*periods, *split_columns, func.count()).select_from(items)
+        if split_by == "project":
+            statement = statement.join(Project, Project.id == items.c.project_id)
+        statement = statement.where(*criteria).group_by(*periods, *split_columns).order_by(*periods)
 
-        project_stats_query = (
-            self.db.query(Project.name, Application.criticity, func.count(Application.id))
+        counts: Dict[Tuple[str, str], int] = {}
+        for row in self.db.execute(statement):
+            period = _period_label(granularity, *row[: len(periods)])
+            if split_by == "project":
+                series = row[len(periods) + 1]
+            elif split_by:
+                value = row[len(periods)]
+                series = value.value if hasattr(value, "value") else str(value or CriticityLevel.medium.value)
+            else:
+                series = "total"
+            counts[(period, series)] = counts.get((period, series), 0) + row[-1]
+        return counts
+
+    def deadline_histogram(
+        self,
+        granularity: str = "quarter",
+        split_by: Optional[str] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        item_type: Optional[str] = None,
+        filters: Optional[DashboardFilter] = None,
+    ) -> DeadlineHistogram:
+        item_types = (item_type,) if item_type else ITEM_TYPES
+        counts = self._histogram_counts(granularity, split_by, start, end, item_types, filters)
+        periods = sorted({period for period, _ in counts})
+        series_names = sorted({series for _, series in counts})
+        return DeadlineHistogram(
+            granularity=granularity,
+            split_by=split_by,
+            periods=periods,
+            series=[
+                HistogramSeries(name=name, counts=[counts.get((period, name), 0) for period in periods])
+                for name in series_names
+            ],
+        )
+
+    def _quarter_histogram(self, filters: Optional[DashboardFilter] = None) -> Dict[str, int]:
+        counts = self._histogram_counts("quarter", item_types=("version",), filters=filters)
+        return {period: count for (period, _), count in counts.items()}
+
+    def _project_criticity(self, filters: Optional[DashboardFilter] = None) -> List[tuple[str, str, int]]:
+        criteria = self._application_criteria(filters)
+        if filters is not None and filters.technology:
+            used = aliased(Dependency)
+            criteria.append(
+                exists().where(used.application_id == Application.id, _technology_match(used, filters.technology))
+            )
+        if filters is not None and filters.deadline_before:
+            # Only count applications with at least one item due before the deadline.
+            due_version = aliased(Version)
+            due_dependency = aliased(Dependency)
+            criteria.append(
+                or_(
+                    exists().where(
+                        due_version.application_id == Application.id,
+                        due_version.end_of_support <= filters.deadline_before,
+                    ),
+                    exists().where(
+                        due_dependency.application_id == Application.id,
+                        due_dependency.end_of_support <= filters.deadline_before,
+                        *([_technology_match(due_dependency, filters.technology)] if filters.technology else []),
+                    ),
+                )
+            )
+        statement = (
+            select(Project.name, Application.criticity, func.count(Application.id))
             .join(Project, Application.project_id == Project.id)
+            .where(*criteria)
             .group_by(Project.name, Application.criticity)
-            .all()
         )
-        project_criticity: List[ProjectCriticityStat] = []
-        for project_name, criticity, count in project_stats_query:
-            project_criticity.append(
-                ProjectCriticityStat(project=project_name, criticity=criticity.value if hasattr(criticity, "value") else criticity, count=count)
+        return [
+            (project_name, criticity.value if hasattr(criticity, "value") else criticity, count)
+            for project_name, criticity, count in self.db.execute(statement)
+        ]
+
+    def shared_dependency_alerts(
+        self, min_count: int = 2, limit: Optional[int] = None, filters: Optional[DashboardFilter] = None
+    ) -> List[DependencyAlert]:
+        """Dependencies sharing the same end of support across at least ``min_count`` usages."""
+        if self.db.get_bind().dialect.name in {"mysql", "mariadb"}:
+            # GROUP_CONCAT silently truncates its result to 1024 bytes by default.
+            self.db.execute(text("SET SESSION group_concat_max_len = 1048576"))
+        statement = (
+            select(
+                Dependency.name,
+                Dependency.end_of_support,
+                func.aggregate_strings(Application.name, SHARED_BY_SEPARATOR),
             )
+            .join(Application, Dependency.application_id == Application.id)
+            .where(Dependency.end_of_support.isnot(None), *self._item_criteria(Dependency, filters))
+            .group_by(Dependency.name, Dependency.end_of_support)
+            .having(func.count(Dependency.id) >= min_count)
+            .order_by(Dependency.end_of_support, Dependency.name)
+        )
+        if limit is not None:
+            statement = statement.limit(limit)
 
-        dependency_alerts: List[DependencyAlert] = []
-        dependency_groups = defaultdict(list)
-        for dependency in self.db.query(Dependency).filter(Dependency.end_of_support.isnot(None)).all():
-            key = (dependency.name, dependency.end_of_support)
-            dependency_groups[key].append(dependency.application.name if dependency.application else "")
-        for (name, eos), apps in dependency_groups.items():
-            if len(apps) < 2:
-                continue
+        alerts: List[DependencyAlert] = []
+        for name, eos, shared_by in self.db.execute(statement):
             bucket = self._deadline_bucket(eos)
-            color = {"< 3 mois": "red", "3-6 mois": "orange", "> 6 mois": "green", "Obsolète": "red"}.get(bucket, "grey")
-            dependency_alerts.append(
+            alerts.append(
                 DependencyAlert(
                     dependency_name=name,
-                    shared_by=apps,
+                    shared_by=shared_by.split(SHARED_BY_SEPARATOR) if shared_by else [],
                     end_of_support=eos,
-                    urgency_color=color,
+                    urgency_color=URGENCY_COLORS.get(bucket, "grey"),
                 )
             )
+        return alerts
 
-        top_items: List[dict[str, str]] = []
-        for version in (
-            self.db.query(Version)
-            .filter(Version.end_of_support.isnot(None))
-            .order_by(Version.end_of_support)
-            .limit(10)
-            .all()
-        ):
-            top_items.append(
-                {
-                    "type": "version",
-                    "application": version.application.name if version.application else "",
-                    "label": version.number,
-                    "deadline": version.end_of_support.isoformat() if version.end_of_support else "",
-                    "criticity": version.application.criticity.value if version.application else "",
-                }
+    def top_priorities(
+        self, limit: int = 10, offset: int = 0, filters: Optional[DashboardFilter] = None
+    ) -> List[Dict[str, str]]:
+        """Versions and dependencies ranked by risk score (deadline proximity x criticity x remediation)."""
+        today = date.today()
+        versions = (
+            select(
+                literal("version").label("type"),
+                Version.id.label("item_id"),
+                Version.number.label("label"),
+                Version.end_of_support.label("end_of_support"),
+                Application.name.label("application"),
+                Application.criticity.label("criticity"),
+                case(
+                    *[(Version.remediation_status == status, weight) for status, weight in REMEDIATION_WEIGHTS.items()],
+                    else_=REMEDIATION_WEIGHTS[RemediationStatus.not_planned],
+                ).label("remediation_weight"),
             )
-        for dependency in (
-            self.db.query(Dependency)
-            .filter(Dependency.end_of_support.isnot(None))
-            .order_by(Dependency.end_of_support)
-            .limit(10)
-            .all()
-        ):
-            top_items.append(
-                {
-                    "type": "dependency",
-                    "application": dependency.application.name if dependency.application else "",
-                    "label": dependency.name,
-                    "deadline": dependency.end_of_support.isoformat() if dependency.end_of_support else "",
-                    "criticity": dependency.application.criticity.value if dependency.application else "",
-                }
+            .join(Application, Version.application_id == Application.id)
+            .where(Version.end_of_support.isnot(None), *self._item_criteria(Version, filters))
+        )
+        dependencies = (
+            select(
+                literal("dependency").label("type"),
+                Dependency.id.label("item_id"),
+                Dependency.name.label("label"),
+                Dependency.end_of_support.label("end_of_support"),
+                Application.name.label("application"),
+                Application.criticity.label("criticity"),
+                # Dependencies carry no remediation status: treat them as not planned.
+                literal(REMEDIATION_WEIGHTS[RemediationStatus.not_planned]).label("remediation_weight"),
+            )
+            .join(Application, Dependency.application_id == Application.id)
+            .where(Dependency.end_of_support.isnot(None), *self._item_criteria(Dependency, filters))
+        )
+        items = union_all(versions, dependencies).subquery("items")
+
+        delta_months = _month_index(items.c.end_of_support) - (today.year * 12 + today.month)
+        proximity_weight = case((delta_months <= 0, 4), (delta_months <= 3, 3), (delta_months <= 6, 2), else_=1)
+        criticity_weight = case(
+            *[(items.c.criticity == criticity, weight) for criticity, weight in CRITICITY_WEIGHTS.items()],
+            else_=CRITICITY_WEIGHTS[CriticityLevel.medium],
+        )
+        risk_score = (proximity_weight * criticity_weight * items.c.remediation_weight).label("risk_score")
+        statement = (
+            select(
+                items.c.type,
+                items.c.label,
+                items.c.end_of_support,
+                items.c.application,
+                items.c.criticity,
+                risk_score,
             )
-        top_items = sorted(top_items, key=lambda item: item.get("deadline") or "")[:10]
+            .order_by(risk_score.desc(), items.c.end_of_support, items.c.type.desc(), items.c.item_id)
+            .limit(limit)
+            .offset(offset)
+        )
+        return [
+            {
+                "type": item_type,
+                "application": application_name,
+                "label": label,
+                "deadline": end_of_support.isoformat() if end_of_support else "",
+                "criticity": criticity.value if criticity else "",
+                "risk_score": str(score),
+            }
+            for item_type, label, end_of_support, application_name, criticity, score in self.db.execute(statement)
+        ]
+
+    def get_metrics(
+        self,
+        filters: Optional[DashboardFilter] = None,
+        shared_min_count: int = 2,
+        shared_limit: Optional[int] = None,
+    ) -> DashboardMetrics:
+        today = date.today()
+        if filters is not None and not any(filters.dict().values()):
+            filters = None
+        snapshot = DashboardSnapshotService(self.db)
+        if filters is None and snapshot.is_initialized():
+            counters, timeline_histogram, project_stats = snapshot.dashboard_counters(today)
+        else:
+            counters = self._inventory_counters(today, filters)
+            timeline_histogram = self._quarter_histogram(filters)
+            project_stats = self._project_criticity(filters)
+        total_items = counters["total_items"]
+        obsolete_count = counters["obsolete"]
+
+        expiring_counter = Counter({"< 3 mois": 0, "3-6 mois": 0, "> 6 mois": 0, "Obsolète": 0})
+        expiring_counter["< 3 mois"] = counters["within_3_months"]
+        expiring_counter["3-6 mois"] = counters["within_6_months"]
+        expiring_counter["> 6 mois"] = counters["later"]
+        expiring_counter["Obsolète"] = obsolete_count
+
+        remediation_stats = [
+            RemediationStats(status=status.value, count=counters[status.name]) for status in RemediationStatus
+        ]
+
+        project_criticity = [
+            ProjectCriticityStat(project=project_name, criticity=criticity, count=count)
+            for project_name, criticity, count in project_stats
+        ]
+
+        dependency_alerts = self.shared_dependency_alerts(shared_min_count, shared_limit, filters)
+
+        top_items = self.top_priorities(limit=10, filters=filters)
 
         return DashboardMetrics(
             total_items=total_items,
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import logging
+import shutil
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO, Callable, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.entities import ImportJob, ImportJobStatus
+from app.services.dashboard import dashboard_cache
+from app.services.import_validation import read_header
+from app.services.importer import CSVImportService
+
+logger = logging.getLogger(__name__)
+
+COPY_BUFFER_SIZE = 1024 * 1024
+CREATED_COUNTERS = ("projects", "applications", "versions", "dependencies")
+
+
+class ImportInterrupted(Exception):
+    """The worker stops or lost the lease of its job: the current chunk is rolled back."""
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def store_upload(source: BinaryIO) -> Path:
+    """Copy an uploaded file to the import directory and check its header right away."""
+    directory = Path(get_settings().import_directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{uuid.uuid4().hex}.csv"
+    source.seek(0)
+    with path.open("wb") as target:
+        shutil.copyfileobj(source, target, COPY_BUFFER_SIZE)
+    try:
+        with path.open("rb") as binary:
+            read_header(binary)
+    except Exception:
+        path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+class ImportJobService:
+    """Persistent CSV import jobs, run by the import workers.
+
+    A running job holds a lease renewed by each committed chunk. The job row
+    is updated in the transaction of the chunk, so ``rows_processed`` is
+    always the number of rows committed: a job whose lease expired (its
+    process died) is claimed again and resumes after these rows.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.settings = get_settings()
+
+    def enqueue(self, filename: str, path: Path, user_id: Optional[int]) -> ImportJob:
+        """Queue the import of a file stored by ``store_upload``; the file is removed if the job cannot be added."""
+        try:
+            job = ImportJob(filename=filename, path=str(path), created_by_id=user_id)
+            self.db.add(job)
+            self.db.commit()
+        except Exception:
+            path.unlink(missing_ok=True)
+            raise
+        logger.info("Import %s mis en file d'attente (%s)", job.id, filename)
+        return job
+
+    def claimable(self, now: datetime):
+        expired = now - timedelta(seconds=self.settings.import_job_lease_seconds)
+        return or_(
+            ImportJob.status == ImportJobStatus.queued,
+            and_(ImportJob.status == ImportJobStatus.running, ImportJob.heartbeat_at < expired),
+        )
+
+    def claim(self) -> Optional[ImportJob]:
+        """Take the oldest queued job, or a running one whose lease expired.
+
+        The claim is a conditional update: when several workers pick the same
+        job, only one of them changes the row and the others look again.
+        ``attempts`` identifies the claim and fences the updates of a worker
+        whose lease was taken over.
+        """
+        while True:
+            now = utcnow()
+            statement = select(ImportJob.id).where(self.claimable(now)).order_by(ImportJob.id).limit(1)
+            job_id = self.db.scalar(statement)
+            if job_id is None:
+                self.db.rollback()
+                return None
+            result = self.db.execute(
+                update(ImportJob)
+                .where(ImportJob.id == job_id, self.claimable(now))
+                .values(
+                    status=ImportJobStatus.running,
+                    heartbeat_at=now,
+                    started_at=func.coalesce(ImportJob.started_at, now),
+                    attempts=ImportJob.attempts + 1,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            if result.rowcount == 1:
+                return self.db.get(ImportJob, job_id, populate_existing=True)
+
+    def run(
+        self,
+        job: ImportJob,
+        should_stop: Callable[[], bool] = lambda: False,
+        invalidate_cache: Callable[[], None] = dashboard_cache.invalidate,
+    ) -> None:
+        """Import the file of a claimed job from its first uncommitted row.
+
+        A worker thread passes an ``invalidate_cache`` that hands the
+        invalidation of the dashboard cache over to the event loop.
+        """
+        job_id, attempt, path, skip = job.id, job.attempts, Path(job.path), job.rows_processed
+        owned = and_(ImportJob.id == job_id, ImportJob.attempts == attempt)
+
+        def progress(rows: int, created: Counter) -> None:
+            if should_stop():
+                raise ImportInterrupted()
+            values = {f"{kind}_created": getattr(ImportJob, f"{kind}_created") + created[kind] for kind in CREATED_COUNTERS}
+            result = self.db.execute(
+                update(ImportJob)
+                .where(owned)
+                .values(rows_processed=ImportJob.rows_processed + rows, heartbeat_at=utcnow(), **values)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
+                raise ImportInterrupted()
+
+        if skip:
+            logger.info("Reprise de l'import %s après %s lignes (tentative %s)", job_id, skip, attempt)
+        try:
+            with path.open("rb") as binary:
+                CSVImportService(self.db).import_stream(binary, skip=skip, on_chunk=progress)
+        except ImportInterrupted:
+            self.db.rollback()
+            self.release(owned)
+            logger.info("Import %s interrompu, il reprendra au dernier bloc validé", job_id)
+            return
+        except HTTPException as exc:
+            self.db.rollback()
+            errors = exc.detail if isinstance(exc.detail, list) else [exc.detail]
+            self.finish(job_id, owned, path, ImportJobStatus.failed, errors)
+        except FileNotFoundError:
+            self.db.rollback()
+            self.finish(job_id, owned, path, ImportJobStatus.failed, ["Fichier d'import introuvable"])
+        except Exception:
+            self.db.rollback()
+            logger.exception("Échec de l'import %s", job_id)
+            self.finish(job_id, owned, path, ImportJobStatus.failed, ["Erreur interne pendant l'import"])
+        else:
+            self.finish(job_id, owned, path, ImportJobStatus.succeeded, [])
+        finally:
+            # Chunks committed before an error are kept.
+            invalidate_cache()
+
+    def release(self, owned) -> None:
+        """Give an interrupted job back to the queue, to be resumed by any worker."""
+        self.db.execute(
+            update(ImportJob)
+            .where(owned)
+            .values(status=ImportJobStatus.queued, heartbeat_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
+    def finish(self, job_id: int, owned, path: Path, job_status: ImportJobStatus, errors: List[str]) -> None:
+        now = utcnow()
+        result = self.db.execute(
+            update(ImportJob)
+            .where(owned)
+            .values(status=job_status, errors=errors, heartbeat_at=now, finished_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        if result.rowcount == 1:
+            path.unlink(missing_ok=True)
+            logger.info("Import %s %s", job_id, "terminé" if job_status == ImportJobStatus.succeeded else "en échec")
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from typing import BinaryIO, Dict, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.entities import Application, Dependency, Project, Version
+from app.services.import_validation import ImportRecord, read_header, validate_segments, validation_workers
+from app.services.importer import CSVImportService
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_SAMPLE_SIZE = 10
+ENTITIES = ("projects", "applications", "versions", "dependencies")
+
+
+def same_value(stored, imported) -> bool:
+    # An empty CSV cell and a null column are the same value.
+    return (stored if stored != "" else None) == (imported if imported != "" else None)
+
+
+class EntityPreview:
+    """Counts and samples of the created, skipped and differing keys of one table."""
+
+    def __init__(self) -> None:
+        self.counts: Counter = Counter()
+        self.samples: Dict[str, List[dict]] = {"created": [], "skipped": [], "differing": []}
+
+    def add(self, outcome: str, sample: dict) -> None:
+        self.counts[outcome] += 1
+        if len(self.samples[outcome]) < PREVIEW_SAMPLE_SIZE:
+            self.samples[outcome].append(sample)
+
+    def classify(self, sample: dict, stored, values: Dict[str, object]) -> bool:
+        """Record a key missing from the table (``stored`` is ``None``) or present in it; return whether it is created."""
+        if stored is None:
+            self.add("created", sample)
+            return True
+        fields = [field for field, value in values.items() if not same_value(stored._mapping[field], value)]
+        if fields:
+            self.add("differing", {**sample, "fields": fields})
+        else:
+            self.add("skipped", sample)
+        return False
+
+    def as_dict(self) -> dict:
+        return {
+            "created": self.counts["created"],
+            "skipped": self.counts["skipped"],
+            "differing": self.counts["differing"],
+            "samples": self.samples,
+        }
+
+
+class ImportPreviewService:
+    """What an import of a CSV inventory would do, computed without writing.
+
+    The keys of the file (project name, application name and project, version
+    number, dependency name and version) are compared by set operations with
+    the keys met earlier in the file, then with the existing rows, looked up
+    with one query per table and per slice of the file, like the import. The
+    first occurrence of a key in the file wins, and existing rows are kept as
+    they are: keys whose file values differ from the stored ones are reported
+    as ``differing``. Like the import, the preview stops at the first faulty
+    row (``stopped_at_line``): the valid rows after it are counted as
+    ``rows_ignored``.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.lookup = CSVImportService(db)
+        # Keys met in the file, folded like the database compares them, with the id
+        # of the existing row or None when the import creates it.
+        self.project_ids: Dict[tuple, Optional[int]] = {}
+        self.application_ids: Dict[tuple, Optional[int]] = {}
+        self.versions: Set[tuple] = set()
+        self.dependencies: Set[tuple] = set()
+        self.entities = {entity: EntityPreview() for entity in ENTITIES}
+        self.rows: Counter = Counter()
+        self.errors: List[str] = []
+        self.stopped_at_line: Optional[int] = None
+
+    def preview(self, binary: BinaryIO, workers: Optional[int] = None) -> dict:
+        settings = get_settings()
+        workers = validation_workers(settings.import_validation_workers if workers is None else workers)
+        fieldnames, first_line = read_header(binary)
+        for result in validate_segments(binary, fieldnames, first_line, workers):
+            self.rows["rejected"] += len(result.errors)
+            self.errors.extend(result.errors[: PREVIEW_SAMPLE_SIZE - len(self.errors)])
+            if self.stopped_at_line is not None:
+                self.rows["ignored"] += len(result.records)
+                continue
+            self.stopped_at_line = result.first_error_line
+            self.rows["ignored"] += len(result.records) - result.before_error
+            records = [ImportRecord._make(record) for record in result.records[: result.before_error]]
+            created_rows: Set[int] = set()
+            self.preview_projects(records, created_rows)
+            self.preview_applications(records, created_rows)
+            self.preview_versions(records, created_rows)
+            self.preview_dependencies(records, created_rows)
+            self.rows["created"] += len(created_rows)
+            self.rows["skipped"] += len(records) - len(created_rows)
+        self.db.rollback()
+        logger.info("Simulation d'import CSV", extra={"context": dict(self.rows)})
+        return {
+            "rows": sum(self.rows.values()),
+            "rows_created": self.rows["created"],
+            "rows_skipped": self.rows["skipped"],
+            "rows_rejected": self.rows["rejected"],
+            "rows_ignored": self.rows["ignored"],
+            "stopped_at_line": self.stopped_at_line,
+            "errors": self.errors,
+            **{entity: preview.as_dict() for entity, preview in self.entities.items()},
+        }
+
+    def first_occurrences(self, records: List[ImportRecord], key_of, seen) -> Dict[tuple, int]:
+        """``{key: index of its first record}`` of the keys of ``records`` not met earlier in the file."""
+        first: Dict[tuple, int] = {}
+        for index, record in enumerate(records):
+            key = key_of(record)
+            if key is not None and key not in seen:
+                first.setdefault(key, index)
+        return first
+
+    def preview_projects(self, records: List[ImportRecord], created_rows: Set[int]) -> None:
+        fold_key = self.lookup.fold_key
+        first = self.first_occurrences(records, lambda record: fold_key((record.project_name,)), self.project_ids)
+        keys = {(records[index].project_name,) for index in first.values()}
+        stored = self.lookup.existing_rows(Project, ("name",), keys, ("team", "contact"))
+        for key, index in first.items():
+            record, row = records[index], stored.get(key)
+            values = {"team": record.project_team, "contact": record.project_contact}
+            if self.entities["projects"].classify({"project": record.project_name}, row, values):
+                created_rows.add(index)
+            self.project_ids[key] = row.id if row else None
+
+    def preview_applications(self, records: List[ImportRecord], created_rows: Set[int]) -> None:
+        fold_key = self.lookup.fold_key
+        first = self.first_occurrences(
+            records, lambda record: fold_key((record.project_name, record.application_name)), self.application_ids
+        )
+        keys = {
+            (records[index].application_name, self.project_ids[key[:1]])
+            for key, index in first.items()
+            if self.project_ids[key[:1]] is not None
+        }
+        stored = self.lookup.existing_rows(
+            Application, ("name", "project_id"), keys, ("description", "owner", "criticity", "status")
+        )
+        for key, index in first.items():
+            record = records[index]
+            row = stored.get((key[1], self.project_ids[key[:1]]))
+            values = {
+                "description": record.application_description,
+                "owner": record.application_owner,
+                "criticity": record.application_criticity,
+                "status": record.application_status,
+            }
+            sample = {"project": record.project_name, "application": record.application_name}
+            if self.entities["applications"].classify(sample, row, values):
+                created_rows.add(index)
+            self.application_ids[key] = row.id if row else None
+
+    def preview_versions(self, records: List[ImportRecord], created_rows: Set[int]) -> None:
+        fold_key = self.lookup.fold_key
+        first = self.first_occurrences(
+            records,
+            lambda record: fold_key((record.project_name, record.application_name, record.version_number))
+            if record.version_number
+            else None,
+            self.versions,
+        )
+        self.versions.update(first)
+        keys = {
+            (self.application_ids[key[:2]], records[index].version_number)
+            for key, index in first.items()
+            if self.application_ids[key[:2]] is not None
+        }
+        stored = self.lookup.existing_rows(
+            Version, ("application_id", "number"), keys, ("end_of_support", "end_of_contract")
+        )
+        for key, index in first.items():
+            record = records[index]
+            row = stored.get((self.application_ids[key[:2]], key[2]))
+            values = {"end_of_support": record.version_end_of_support, "end_of_contract": record.version_end_of_contract}
+            sample = {"project": record.project_name, "application": record.application_name, "version": record.version_number}
+            if self.entities["versions"].classify(sample, row, values):
+                created_rows.add(index)
+
+    def preview_dependencies(self, records: List[ImportRecord], created_rows: Set[int]) -> None:
+        fold_key = self.lookup.fold_key
+        first = self.first_occurrences(
+            records,
+            lambda record: fold_key(
+                (record.project_name, record.application_name, record.dependency_name, record.dependency_version)
+            )
+            if record.dependency_name
+            else None,
+            self.dependencies,
+        )
+        self.dependencies.update(first)
+        keys = {
+            (self.application_ids[key[:2]], records[index].dependency_name, records[index].dependency_version)
+            for key, index in first.items()
+            if self.application_ids[key[:2]] is not None
+        }
+        stored = self.lookup.existing_rows(
+            Dependency, ("application_id", "name", "version"), keys, ("category", "end_of_support")
+        )
+        for key, index in first.items():
+            record = records[index]
+            row = stored.get((self.application_ids[key[:2]], key[2], key[3]))
+            values = {"category": record.dependency_category, "end_of_support": record.dependency_end_of_support}
+            sample = {
+                "project": record.project_name,
+                "application": record.application_name,
+                "dependency": record.dependency_name,
+                "version": record.dependency_version,
+            }
+            if self.entities["dependencies"].classify(sample, row, values):
+                created_rows.add(index)
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import csv
+import io
+import itertools
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime
+from functools import lru_cache
+from typing import BinaryIO, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.models.entities import ApplicationStatus, CriticityLevel, DependencyCategory
+
+CSV_HEADERS = [
+    "project_name",
+    "project_team",
+    "project_contact",
+    "application_name",
+    "application_description",
+    "application_owner",
+    "application_criticity",
+    "application_status",
+    "version_number",
+    "version_end_of_support",
+    "version_end_of_contract",
+    "dependency_category",
+    "dependency_name",
+    "dependency_version",
+    "dependency_end_of_support",
+]
+
+# Size of the slices of the file validated by one task; a slice ends on a record boundary.
+SEGMENT_BYTES = 1024 * 1024
+MAX_REPORTED_ERRORS = 1000
+# Validation processes are started from a process running threads: never fork it.
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class RowValidationError(ValueError):
+    """A CSV row that cannot be imported; the message is shown to the user with the line number."""
+
+
+class ImportRecord(NamedTuple):
+    """One validated CSV row, with the columns of ``CSV_HEADERS`` typed.
+
+    Version fields are ``None`` without ``version_number``, dependency fields
+    without ``dependency_name``.
+    """
+
+    project_name: str
+    project_team: Optional[str]
+    project_contact: Optional[str]
+    application_name: str
+    application_description: Optional[str]
+    application_owner: Optional[str]
+    application_criticity: CriticityLevel
+    application_status: ApplicationStatus
+    version_number: Optional[str]
+    version_end_of_support: Optional[date]
+    version_end_of_contract: Optional[date]
+    dependency_category: Optional[DependencyCategory]
+    dependency_name: Optional[str]
+    dependency_version: Optional[str]
+    dependency_end_of_support: Optional[date]
+
+
+class SegmentResult(NamedTuple):
+    # Plain tuples: a named tuple costs a call per row to unpickle.
+    records: List[tuple]
+    errors: List[str]
+    # Records read before the first faulty row of the slice, and the line of that row.
+    before_error: int
+    first_error_line: Optional[int]
+
+
+@lru_cache(maxsize=4096)
+def parse_date_value(value: str) -> Optional[date]:
+    """Inventories repeat the same few dates a lot: parse each distinct value once."""
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_date(value: str | None) -> Optional[date]:
+    if not value:
+        return None
+    parsed = parse_date_value(value)
+    if parsed is None:
+        raise RowValidationError(f"Date invalide: {value}")
+    return parsed
+
+
+def parse_enum(enum, value: str | None, default, label: str):
+    if not value:
+        return default
+    try:
+        return enum(value)
+    except ValueError:
+        if value in enum.__members__:
+            return enum[value]
+        raise RowValidationError(f"{label} invalide: {value}")
+
+
+def parse_row(row: dict) -> ImportRecord:
+    """Validate one CSV row read by a ``csv.DictReader``."""
+    project_name = (row["project_name"] or "").strip()
+    if not project_name:
+        raise RowValidationError("Nom de projet manquant")
+    application_name = (row["application_name"] or "").strip()
+    if not application_name:
+        raise RowValidationError("Nom d'application manquant")
+    version_number = row.get("version_number") or None
+    version_end_of_support = version_end_of_contract = None
+    if version_number:
+        version_end_of_support = parse_date(row["version_end_of_support"])
+        version_end_of_contract = parse_date(row["version_end_of_contract"])
+    dependency_name = row.get("dependency_name") or None
+    dependency_category = dependency_version = dependency_end_of_support = None
+    if dependency_name:
+        try:
+            dependency_category = DependencyCategory(row.get("dependency_category") or DependencyCategory.other.value)
+        except ValueError:
+            dependency_category = DependencyCategory.other
+        dependency_version = row.get("dependency_version")
+        dependency_end_of_support = parse_date(row.get("dependency_end_of_support"))
+    return ImportRecord(
+        project_name,
+        row["project_team"],
+        row["project_contact"],
+        application_name,
+        row["application_description"],
+        row["application_owner"],
+        parse_enum(CriticityLevel, row["application_criticity"], CriticityLevel.medium, "Criticité"),
+        parse_enum(ApplicationStatus, row["application_status"], ApplicationStatus.active, "Statut"),
+        version_number,
+        version_end_of_support,
+        version_end_of_contract,
+        dependency_category,
+        dependency_name,
+        dependency_version,
+        dependency_end_of_support,
+    )
+
+
+def check_headers(fieldnames: Optional[List[str]]) -> None:
+    missing_headers = [header for header in CSV_HEADERS if header not in (fieldnames or [])]
+    if missing_headers:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Colonnes manquantes: {', '.join(missing_headers)}",
+        )
+
+
+def complete_record(binary: BinaryIO, data: bytes) -> bytes:
+    """Extend ``data``, read from a record boundary, with whole lines up to the end of its last record.
+
+    A newline ends a record only after an even number of quote characters
+    (escaped quotes are doubled), otherwise it belongs to a quoted field.
+    """
+    parts, quotes, tail = [data], data.count(b'"'), data
+    while not tail.endswith(b"\n") or quotes % 2:
+        tail = binary.readline()
+        if not tail:
+            break
+        parts.append(tail)
+        quotes += tail.count(b'"')
+    return b"".join(parts)
+
+
+def read_header(binary: BinaryIO) -> Tuple[List[str], int]:
+    """Read and check the header of the file; return the column names and the number of its first data line."""
+    header = complete_record(binary, b"")
+    try:
+        text = header.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Encodage invalide, UTF-8 attendu") from exc
+    fieldnames = next(csv.reader(io.StringIO(text, newline="")), None)
+    check_headers(fieldnames)
+    return fieldnames, 1 + header.count(b"\n")
+
+
+def split_segments(binary: BinaryIO, first_line: int, segment_bytes: int = SEGMENT_BYTES) -> Iterator[Tuple[bytes, int]]:
+    """Cut the rest of the file in slices of whole records, with the number of their first line."""
+    line = first_line
+    while True:
+        data = binary.read(segment_bytes)
+        if not data:
+            return
+        data = complete_record(binary, data)
+        yield data, line
+        line += data.count(b"\n")
+
+
+def validate_segment(data: bytes, first_line: int, fieldnames: List[str]) -> SegmentResult:
+    """Parse and validate one slice of the file, collecting the error of every faulty row."""
+    records: List[tuple] = []
+    errors: List[str] = []
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        line = first_line + data.count(b"\n", 0, exc.start)
+        return SegmentResult(records, [f"Ligne {line} : Encodage invalide, UTF-8 attendu"], 0, line)
+    reader = csv.DictReader(io.StringIO(text, newline=""), fieldnames=fieldnames)
+    before_error, first_error_line = None, None
+    for row in reader:
+        try:
+            records.append(tuple(parse_row(row)))
+        except RowValidationError as exc:
+            line = first_line + reader.line_num - 1
+            if first_error_line is None:
+                before_error, first_error_line = len(records), line
+            errors.append(f"Ligne {line} : {exc}")
+    return SegmentResult(records, errors, len(records) if before_error is None else before_error, first_error_line)
+
+
+def validation_workers(workers: Optional[int]) -> int:
+    return workers if workers else os.cpu_count() or 1
+
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def validation_pool(workers: int) -> ProcessPoolExecutor:
+    """The pool of ``workers`` processes shared by all imports, started on first use."""
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            context = multiprocessing.get_context(POOL_START_METHOD)
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        return pool
+
+
+def discard_validation_pool(workers: int, pool: ProcessPoolExecutor) -> None:
+    """Forget a pool whose process died, so that the next import starts a new one."""
+    with _pools_lock:
+        if _pools.get(workers) is pool:
+            del _pools[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def validate_segments(binary: BinaryIO, fieldnames: List[str], first_line: int, workers: int) -> Iterator[SegmentResult]:
+    """Validate the slices of the file in order, in the shared pool of ``workers`` processes.
+
+    At most two slices per process are in flight, so that memory stays flat
+    when the writer is slower than the validation. A file of one slice, or a
+    single worker, is validated in this process.
+    """
+    segments = split_segments(binary, first_line)
+    head = list(itertools.islice(segments, 2))
+    if workers <= 1 or len(head) < 2:
+        for data, line in itertools.chain(head, segments):
+            yield validate_segment(data, line, fieldnames)
+        return
+    pool = validation_pool(workers)
+    pending: Deque = deque()
+    try:
+        for data, line in itertools.chain(head, segments):
+            pending.append(pool.submit(validate_segment, data, line, fieldnames))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    except BrokenProcessPool:
+        discard_validation_pool(workers, pool)
+        raise
+    finally:
+        # The pool outlives this import: drop the slices nobody will read.
+        for future in pending:
+            future.cancel()
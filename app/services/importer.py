@@ -3,36 +3,89 @@ from __future__ import annotations
 import csv
 import io
 import logging
-from datetime import datetime
+import unicodedata
+from collections import Counter
+from types import SimpleNamespace
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+
 from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import Row, insert, select
 from sqlalchemy.orm import Session
 
-from app.models.entities import Application, Dependency, DependencyCategory, Project, Version
+from app.core.config import get_settings
+from app.models.entities import Application, Dependency, Project, RemediationStatus, Version
+from app.services.import_validation import (
+    CSV_HEADERS,
+    MAX_REPORTED_ERRORS,
+    ImportRecord,
+    read_header,
+    validate_segments,
+    validation_workers,
+)
+from app.services.snapshot import (
+    DashboardSnapshotService,
+    application_contributions,
+    dependency_contributions,
+    version_contributions,
+)
 
 logger = logging.getLogger(__name__)
 
-CSV_HEADERS = [
-    "project_name",
-    "project_team",
-    "project_contact",
-    "application_name",
-    "application_description",
-    "application_owner",
-    "application_criticity",
-    "application_status",
-    "version_number",
-    "version_end_of_support",
-    "version_end_of_contract",
-    "dependency_category",
-    "dependency_name",
-    "dependency_version",
-    "dependency_end_of_support",
-]
+# Called with the number of rows of a chunk and the rows it created, before the chunk is committed.
+ChunkCallback = Callable[[int, Counter], None]
+
+
+# Keys looked up per query: two IN lists of at most 400 values stay below the
+# 999 bound variables of older SQLite builds, whatever IMPORT_CHUNK_SIZE is.
+EXISTING_KEYS_BATCH_SIZE = 400
+
+# Dialects whose default collations compare strings regardless of case, accents and trailing spaces.
+CASE_INSENSITIVE_DIALECTS = {"mysql", "mariadb"}
+
+
+def fold_value(value):
+    if not isinstance(value, str):
+        return value
+    stripped = "".join(char for char in unicodedata.normalize("NFKD", value) if not unicodedata.combining(char))
+    return stripped.casefold().rstrip(" ")
+
+
+def key_folder(dialect_name: str) -> Callable[[tuple], tuple]:
+    """The function mapping a key to the form under which the database considers it equal to others."""
+    if dialect_name in CASE_INSENSITIVE_DIALECTS:
+        return lambda key: tuple(map(fold_value, key))
+    return lambda key: key
+
+
+def version_values(record: ImportRecord, application_id: int) -> Optional[dict]:
+    if not record.version_number:
+        return None
+    return {
+        "application_id": application_id,
+        "number": record.version_number,
+        "end_of_support": record.version_end_of_support,
+        "end_of_contract": record.version_end_of_contract,
+        "remediation_status": RemediationStatus.not_planned,
+    }
+
+
+def dependency_values(record: ImportRecord, application_id: int) -> Optional[dict]:
+    if not record.dependency_name:
+        return None
+    return {
+        "application_id": application_id,
+        "category": record.dependency_category,
+        "name": record.dependency_name,
+        "version": record.dependency_version,
+        "end_of_support": record.dependency_end_of_support,
+    }
 
 
 class CSVImportService:
     def __init__(self, db: Session):
         self.db = db
+        # Keys of the file are deduplicated and matched with the existing rows the way the database compares them.
+        self.fold_key = key_folder(db.get_bind().dialect.name)
 
     def generate_template(self) -> bytes:
         output = io.StringIO()
@@ -40,111 +93,170 @@ class CSVImportService:
         writer.writeheader()
         return output.getvalue().encode("utf-8")
 
-    def parse_date(self, value: str | None):
-        if not value:
-            return None
-        for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
-            try:
-                return datetime.strptime(value, fmt).date()
-            except ValueError:
-                continue
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Date invalide: {value}")
-
-    def import_csv(self, file: UploadFile) -> dict[str, int]:
-        content = file.file.read().decode("utf-8-sig")
-        reader = csv.DictReader(io.StringIO(content))
-        missing_headers = [header for header in CSV_HEADERS if header not in reader.fieldnames]
-        if missing_headers:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Colonnes manquantes: {', '.join(missing_headers)}",
+    def import_csv(self, file: UploadFile, chunk_size: Optional[int] = None) -> dict[str, int]:
+        """Import an uploaded inventory, read slice by slice from the spooled file."""
+        file.file.seek(0)
+        return self.import_stream(file.file, chunk_size)
+
+    def import_stream(
+        self,
+        binary: BinaryIO,
+        chunk_size: Optional[int] = None,
+        skip: int = 0,
+        on_chunk: Optional[ChunkCallback] = None,
+        workers: Optional[int] = None,
+    ) -> dict[str, int]:
+        """Import a CSV inventory read from a binary stream, without loading it in memory.
+
+        The file is validated by slices in ``workers`` processes
+        (``IMPORT_VALIDATION_WORKERS``) while this process writes the typed
+        records, committing every ``chunk_size`` rows (``IMPORT_CHUNK_SIZE``).
+        The rows before the first faulty row are committed and nothing is
+        written after it, but the rest of the file is still validated so that
+        every error is reported at once. The first ``skip`` rows, committed by
+        a previous run, are not written again; ``on_chunk`` is called in the
+        transaction of each chunk, before its commit.
+        """
+        settings = get_settings()
+        chunk_size = chunk_size or settings.import_chunk_size
+        workers = validation_workers(settings.import_validation_workers if workers is None else workers)
+        fieldnames, first_line = read_header(binary)
+        created: Counter = Counter()
+        chunk: List[ImportRecord] = []
+        errors: List[str] = []
+        error_count = rows = 0
+        for result in validate_segments(binary, fieldnames, first_line, workers):
+            if not error_count:
+                records = result.records[: result.before_error]
+                if rows < skip:
+                    records = records[skip - rows :]
+                rows += result.before_error
+                for record in map(ImportRecord._make, records):
+                    chunk.append(record)
+                    if len(chunk) >= chunk_size:
+                        self.import_chunk(chunk, created, on_chunk)
+                        chunk = []
+            if result.errors:
+                error_count += len(result.errors)
+                errors.extend(result.errors[: MAX_REPORTED_ERRORS - len(errors)])
+        self.import_chunk(chunk, created, on_chunk)
+        if error_count:
+            if error_count > len(errors):
+                errors.append(f"… et {error_count - len(errors)} autres erreurs")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors)
+        logger.info("Import CSV terminé", extra={"context": {"rows": rows, "skipped": skip, **created}})
+        return {
+            "projects_created": created["projects"],
+            "applications_created": created["applications"],
+            "versions_created": created["versions"],
+            "dependencies_created": created["dependencies"],
+        }
+
+    def import_chunk(self, records: List[ImportRecord], created: Counter, on_chunk: Optional[ChunkCallback] = None) -> None:
+        """Write one chunk of records with a few set-based statements, then commit it.
+
+        Existing keys are looked up with one query per table for the whole
+        chunk and missing rows are inserted with one executemany statement, the
+        first occurrence in the file winning as with a row by row import.
+        """
+        snapshot_delta: Counter = Counter()
+        created_before = created.copy()
+
+        fold_key = self.fold_key
+        project_values: Dict[tuple, dict] = {}
+        for record in records:
+            project_values.setdefault(
+                fold_key((record.project_name,)),
+                {"name": record.project_name, "team": record.project_team, "contact": record.project_contact},
+            )
+        projects = self.existing_keys(Project, ("name",), [(values["name"],) for values in project_values.values()])
+        missing_projects = [values for key, values in project_values.items() if key not in projects]
+        projects.update(self.insert_missing(Project, ("name",), missing_projects))
+        created["projects"] += len(missing_projects)
+
+        application_keys: List[tuple] = []
+        application_values: Dict[tuple, dict] = {}
+        for record in records:
+            key = fold_key((record.application_name, projects[fold_key((record.project_name,))]))
+            application_keys.append(key)
+            application_values.setdefault(
+                key,
+                {
+                    "name": record.application_name,
+                    "project_id": key[1],
+                    "description": record.application_description,
+                    "owner": record.application_owner,
+                    "criticity": record.application_criticity,
+                    "status": record.application_status,
+                },
             )
+        applications = self.existing_keys(
+            Application, ("name", "project_id"), [(values["name"], values["project_id"]) for values in application_values.values()]
+        )
+        missing_applications = [values for key, values in application_values.items() if key not in applications]
+        applications.update(self.insert_missing(Application, ("name", "project_id"), missing_applications))
+        created["applications"] += len(missing_applications)
+        for values in missing_applications:
+            snapshot_delta.update(application_contributions(SimpleNamespace(**values)))
 
-        created_projects = 0
-        created_applications = 0
-        created_versions = 0
-        created_dependencies = 0
-
-        for row in reader:
-            project_name = row["project_name"].strip()
-            if not project_name:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Nom de projet manquant")
-            project = self.db.query(Project).filter(Project.name == project_name).one_or_none()
-            if not project:
-                project = Project(name=project_name, team=row["project_team"], contact=row["project_contact"])
-                self.db.add(project)
-                self.db.flush()
-                created_projects += 1
-
-            application_name = row["application_name"].strip()
-            if not application_name:
-                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Nom d'application manquant")
-            application = (
-                self.db.query(Application)
-                .filter(Application.name == application_name, Application.project_id == project.id)
-                .one_or_none()
+        for values_of, counter, model, key_columns, contributions in (
+            (version_values, "versions", Version, ("application_id", "number"), version_contributions),
+            (dependency_values, "dependencies", Dependency, ("application_id", "name", "version"), dependency_contributions),
+        ):
+            values_by_key: Dict[tuple, dict] = {}
+            for record, application_key in zip(records, application_keys):
+                values = values_of(record, applications[application_key])
+                if values:
+                    values_by_key.setdefault(fold_key(tuple(values[column] for column in key_columns)), values)
+            existing = self.existing_keys(
+                model, key_columns, [tuple(values[column] for column in key_columns) for values in values_by_key.values()]
             )
-            if not application:
-                application = Application(
-                    name=application_name,
-                    project_id=project.id,
-                    description=row["application_description"],
-                    owner=row["application_owner"],
-                    criticity=row["application_criticity"] or None,
-                    status=row["application_status"] or None,
-                )
-                self.db.add(application)
-                self.db.flush()
-                created_applications += 1
-
-            if row.get("version_number"):
-                existing_version = (
-                    self.db.query(Version)
-                    .filter(Version.application_id == application.id, Version.number == row["version_number"])
-                    .one_or_none()
-                )
-                if not existing_version:
-                    version = Version(
-                        application_id=application.id,
-                        number=row["version_number"],
-                        end_of_support=self.parse_date(row["version_end_of_support"]),
-                        end_of_contract=self.parse_date(row["version_end_of_contract"]),
-                    )
-                    self.db.add(version)
-                    self.db.flush()
-                    created_versions += 1
-
-            if row.get("dependency_name"):
-                category_value = row.get("dependency_category") or DependencyCategory.other.value
-                try:
-                    category = DependencyCategory(category_value)
-                except ValueError:
-                    category = DependencyCategory.other
-                existing_dependency = (
-                    self.db.query(Dependency)
-                    .filter(
-                        Dependency.application_id == application.id,
-                        Dependency.name == row["dependency_name"],
-                        Dependency.version == row.get("dependency_version"),
-                    )
-                    .one_or_none()
-                )
-                if not existing_dependency:
-                    dependency = Dependency(
-                        application_id=application.id,
-                        category=category,
-                        name=row["dependency_name"],
-                        version=row.get("dependency_version"),
-                        end_of_support=self.parse_date(row.get("dependency_end_of_support")),
-                    )
-                    self.db.add(dependency)
-                    self.db.flush()
-                    created_dependencies += 1
+            missing = [values for key, values in values_by_key.items() if key not in existing]
+            if missing:
+                # Core insert of the table: ORM bulk inserts drop None values and split the batch on them.
+                self.db.execute(insert(model.__table__), missing)
+            created[counter] += len(missing)
+            for values in missing:
+                snapshot_delta.update(contributions(SimpleNamespace(**values)))
 
+        DashboardSnapshotService(self.db).apply(added=snapshot_delta)
+        if on_chunk:
+            on_chunk(len(records), created - created_before)
         self.db.commit()
-        return {
-            "projects_created": created_projects,
-            "applications_created": created_applications,
-            "versions_created": created_versions,
-            "dependencies_created": created_dependencies,
-        }
+
+    def existing_keys(self, model, key_columns: Tuple[str, ...], keys) -> Dict[tuple, int]:
+        """``{folded key: id}`` of the rows of ``model`` among ``keys``, with one query."""
+        return {key: row.id for key, row in self.existing_rows(model, key_columns, keys).items()}
+
+    def existing_rows(self, model, key_columns: Tuple[str, ...], keys, columns: Tuple[str, ...] = ()) -> Dict[tuple, Row]:
+        """``{folded key: (key columns, id, columns)}`` of the rows of ``model`` among ``keys``.
+
+        Each query, one per ``EXISTING_KEYS_BATCH_SIZE`` keys, filters each of
+        the first two key columns with an ``IN`` list, which are never null;
+        the whole key (possibly with a null dependency version) is compared in
+        Python, folded by ``fold_key`` like the database compares it.
+        """
+        keys = list(keys)
+        key_attributes = [getattr(model, column) for column in key_columns]
+        selected = select(*key_attributes, model.id, *[getattr(model, column) for column in columns])
+        wanted = {self.fold_key(key) for key in keys}
+        found: Dict[tuple, Row] = {}
+        for start in range(0, len(keys), EXISTING_KEYS_BATCH_SIZE):
+            batch = keys[start : start + EXISTING_KEYS_BATCH_SIZE]
+            conditions = [attribute.in_({key[index] for key in batch}) for index, attribute in enumerate(key_attributes[:2])]
+            for row in self.db.execute(selected.where(*conditions)):
+                key = self.fold_key(tuple(row[: len(key_columns)]))
+                if key in wanted:
+                    found[key] = row
+        return found
+
+    def insert_missing(self, model, key_columns: Tuple[str, ...], rows: List[dict]) -> Dict[tuple, int]:
+        """Insert ``rows`` with one executemany statement and return their ids.
+
+        The ids are read back with one query: SQLite cannot order the rows of a
+        multi-row ``INSERT ... RETURNING``, which SQLAlchemy then sends one by one.
+        """
+        if not rows:
+            return {}
+        self.db.execute(insert(model.__table__), rows)
+        return self.existing_keys(model, key_columns, {tuple(row[column] for column in key_columns) for row in rows})
@@ -20,7 +20,8 @@ class NotificationService:
     def __init__(self, db: Session):
         self.db = db
 
-    def _send_email(self, recipients: Iterable[str], subject: str, body: str) -> str:
+    @staticmethod
+    def deliver_email(recipients: Iterable[str], subject: str, body: str) -> str:
         if not settings.smtp_host or not settings.smtp_sender:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -50,7 +51,8 @@ class NotificationService:
             logger.exception("Erreur d'envoi SMTP")
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Envoi SMTP échoué") from exc
 
-    def _send_teams(self, summary: str) -> str:
+    @staticmethod
+    def deliver_teams(summary: str) -> str:
         if not settings.teams_webhook_url:
             raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Webhook Teams non configuré")
         payload = {"text": summary}
@@ -95,7 +97,7 @@ class NotificationService:
         subject: str,
         body: str,
     ) -> Notification:
-        status_msg = self._send_email(recipients, subject, body)
+        status_msg = self.deliver_email(recipients, subject, body)
         return self.log_notification(target_type, target_id, NotificationType.email, recipients, status_msg, body)
 
     def send_teams_notification(
@@ -104,7 +106,7 @@ class NotificationService:
         target_id: int,
         summary: str,
     ) -> Notification:
-        status_msg = self._send_teams(summary)
+        status_msg = self.deliver_teams(summary)
         return self.log_notification(target_type, target_id, NotificationType.teams, ["teams"], status_msg, summary)
 
     def upcoming_obsolescences(self, within_months: int) -> List[tuple[Application, Optional[Version], Optional[Dependency]]]:
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, func, insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.entities import (
+    Application,
+    CriticityLevel,
+    DashboardSnapshot,
+    Dependency,
+    Project,
+    RemediationStatus,
+    Version,
+)
+
+logger = logging.getLogger(__name__)
+
+SnapshotKey = Tuple[str, str]
+
+# Metrics stored in ``dashboard_snapshot``. End-of-support dates are kept per
+# day rather than per bucket so that bucket boundaries, which move with the
+# current date, can be evaluated at read time without any rebuild.
+ITEMS = "items"
+END_OF_SUPPORT = "end_of_support"
+REMEDIATION_STATUS = "remediation_status"
+PROJECT_CRITICITY = "project_criticity"
+META = "meta"
+INITIALIZED_KEY = (META, "initialized")
+
+# INSERT constructs of the dialects supporting an upsert on the (metric, key) unique constraint.
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert, "mysql": mysql.insert, "mariadb": mysql.insert}
+
+
+def _enum_value(value, default) -> str:
+    if value is None:
+        value = default
+    return value.value if hasattr(value, "value") else str(value)
+
+
+def version_contributions(version: Version) -> Counter:
+    contributions: Counter = Counter()
+    contributions[(ITEMS, "version")] += 1
+    contributions[(REMEDIATION_STATUS, _enum_value(version.remediation_status, RemediationStatus.not_planned))] += 1
+    if version.end_of_support:
+        contributions[(END_OF_SUPPORT, f"version:{version.end_of_support.isoformat()}")] += 1
+    return contributions
+
+
+def dependency_contributions(dependency: Dependency) -> Counter:
+    contributions: Counter = Counter()
+    contributions[(ITEMS, "dependency")] += 1
+    if dependency.end_of_support:
+        contributions[(END_OF_SUPPORT, f"dependency:{dependency.end_of_support.isoformat()}")] += 1
+    return contributions
+
+
+def application_contributions(application: Application) -> Counter:
+    criticity = _enum_value(application.criticity, CriticityLevel.medium)
+    return Counter({(PROJECT_CRITICITY, f"{application.project_id}:{criticity}"): 1})
+
+
+class DashboardSnapshotService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def is_initialized(self) -> bool:
+        statement = select(DashboardSnapshot.id).where(
+            DashboardSnapshot.metric == INITIALIZED_KEY[0], DashboardSnapshot.key == INITIALIZED_KEY[1]
+        )
+        return self.db.execute(statement).first() is not None
+
+    def _aggregate(self, *criteria) -> Counter:
+        """Compute snapshot counts from the inventory, optionally restricted to some applications."""
+        counts: Counter = Counter()
+
+        version_statement = (
+            select(Version.remediation_status, Version.end_of_support, func.count(Version.id))
+            .join(Application, Version.application_id == Application.id)
+            .where(*criteria)
+            .group_by(Version.remediation_status, Version.end_of_support)
+        )
+        for remediation_status, end_of_support, count in self.db.execute(version_statement):
+            counts[(ITEMS, "version")] += count
+            counts[(REMEDIATION_STATUS, _enum_value(remediation_status, RemediationStatus.not_planned))] += count
+            if end_of_support:
+                counts[(END_OF_SUPPORT, f"version:{end_of_support.isoformat()}")] += count
+
+        dependency_statement = (
+            select(Dependency.end_of_support, func.count(Dependency.id))
+            .join(Application, Dependency.application_id == Application.id)
+            .where(*criteria)
+            .group_by(Dependency.end_of_support)
+        )
+        for end_of_support, count in self.db.execute(dependency_statement):
+            counts[(ITEMS, "dependency")] += count
+            if end_of_support:
+                counts[(END_OF_SUPPORT, f"dependency:{end_of_support.isoformat()}")] += count
+
+        application_statement = (
+            select(Application.project_id, Application.criticity, func.count(Application.id))
+            .where(*criteria)
+            .group_by(Application.project_id, Application.criticity)
+        )
+        for project_id, criticity, count in self.db.execute(application_statement):
+            counts[(PROJECT_CRITICITY, f"{project_id}:{_enum_value(criticity, CriticityLevel.medium)}")] += count
+
+        return counts
+
+    def application_totals(self, application_id: int) -> Counter:
+        return self._aggregate(Application.id == application_id)
+
+    def project_totals(self, project_id: int) -> Counter:
+        return self._aggregate(Application.project_id == project_id)
+
+    def remove_application(self, application_id: int) -> None:
+        self.apply(removed=self.application_totals(application_id))
+
+    def remove_project(self, project_id: int) -> None:
+        self.apply(removed=self.project_totals(project_id))
+
+    def rebuild(self) -> None:
+        counts = self._aggregate()
+        counts[INITIALIZED_KEY] = 1
+        self.db.execute(delete(DashboardSnapshot))
+        self.db.execute(
+            insert(DashboardSnapshot),
+            [{"metric": metric, "key": key, "count": count} for (metric, key), count in counts.items() if count],
+        )
+        logger.info("Snapshot du tableau de bord reconstruit (%s lignes)", len(counts))
+
+    def apply(self, added: Optional[Counter] = None, removed: Optional[Counter] = None) -> None:
+        """Apply the difference between two sets of contributions within the current transaction."""
+        deltas: Counter = Counter()
+        deltas.update(added or {})
+        deltas.subtract(removed or {})
+        deltas = Counter({key: delta for key, delta in deltas.items() if delta})
+        if not deltas or not self.is_initialized():
+            return
+
+        # One statement per kind of change, whatever the number of keys (imports touch thousands of dates).
+        # The increments are upserts: two transactions adding the same new key cannot both insert it.
+        table = DashboardSnapshot.__table__
+        self.db.execute(
+            self._increment_statement(table),
+            [{"metric": metric, "key": key, "count": delta} for (metric, key), delta in deltas.items()],
+        )
+        same_key = (table.c.metric == bindparam("b_metric"), table.c.key == bindparam("b_key"))
+        emptied = [{"b_metric": metric, "b_key": key} for (metric, key), delta in deltas.items() if delta < 0]
+        if emptied:
+            self.db.execute(delete(table).where(*same_key, table.c.count <= 0), emptied)
+
+    def _increment_statement(self, table):
+        """``INSERT`` of the deltas adding them to the counts of the keys already present."""
+        statement = UPSERT_INSERTS[self.db.get_bind().dialect.name](table)
+        if isinstance(statement, mysql.Insert):
+            return statement.on_duplicate_key_update(count=table.c.count + statement.inserted["count"], updated_at=func.now())
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.metric, table.c.key],
+            set_={"count": table.c.count + statement.excluded["count"], "updated_at": func.now()},
+        )
+
+    def read(self) -> Dict[SnapshotKey, int]:
+        statement = select(DashboardSnapshot.metric, DashboardSnapshot.key, DashboardSnapshot.count)
+        return {(metric, key): count for metric, key, count in self.db.execute(statement)}
+
+    def dashboard_counters(
+        self, today: date
+    ) -> Tuple[Dict[str, int], Dict[str, int], List[Tuple[str, str, int]]]:
+        """Return the counters, quarter histogram and project/criticity stats of the dashboard."""
+        rows = self.read()
+        current_month = today.year * 12 + today.month
+        counters = {
+            "total_items": 0,
+            "obsolete": 0,
+            "within_3_months": 0,
+            "within_6_months": 0,
+            "later": 0,
+            **{status.name: 0 for status in RemediationStatus},
+        }
+        histogram: Counter = Counter()
+        project_counts: List[Tuple[int, str, int]] = []
+
+        for (metric, key), count in rows.items():
+            if metric == ITEMS:
+                counters["total_items"] += count
+            elif metric == REMEDIATION_STATUS:
+                counters[RemediationStatus(key).name] += count
+            elif metric == END_OF_SUPPORT:
+                item_type, _, iso_date = key.partition(":")
+                end_of_support = date.fromisoformat(iso_date)
+                delta_months = end_of_support.year * 12 + end_of_support.month - current_month
+                if end_of_support < today:
+                    counters["obsolete"] += count
+                if 1 <= delta_months <= 3:
+                    counters["within_3_months"] += count
+                elif 4 <= delta_months <= 6:
+                    counters["within_6_months"] += count
+                elif delta_months > 6:
+                    counters["later"] += count
+                if item_type == "version":
+                    histogram[(end_of_support.year, (end_of_support.month - 1) // 3 + 1)] += count
+            elif metric == PROJECT_CRITICITY:
+                project_id, _, criticity = key.partition(":")
+                project_counts.append((int(project_id), criticity, count))
+
+        project_names: Dict[int, str] = {}
+        if project_counts:
+            project_ids = {project_id for project_id, _, _ in project_counts}
+            statement = select(Project.id, Project.name).where(Project.id.in_(project_ids))
+            project_names = dict(self.db.execute(statement).tuples().all())
+        project_criticity = sorted(
+            (project_names[project_id], criticity, count)
+            for project_id, criticity, count in project_counts
+            if project_id in project_names
+        )
+        timeline_histogram = {f"{year}-T{quarter}": count for (year, quarter), count in sorted(histogram.items())}
+        return counters, timeline_histogram, project_criticity
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import List, Optional
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.services.dashboard import dashboard_cache
+from app.services.import_jobs import ImportJobService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class ImportWorkerPool:
+    """Threads running the queued CSV import jobs, one job at a time each.
+
+    Workers poll the queue every ``IMPORT_POLL_SECONDS`` and are woken up
+    right away when a job is enqueued by this process. On shutdown, a running
+    job stops before its next commit and goes back to the queue. The pool is
+    started from the event loop, which owns the dashboard cache the workers
+    invalidate.
+    """
+
+    def __init__(self, workers: int, poll_seconds: float):
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self.work, name=f"import-worker-{index}", daemon=True)
+            for index in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self, timeout: float = 30) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def invalidate_cache(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(dashboard_cache.invalidate)
+        except RuntimeError:  # pragma: no cover - the loop closed during shutdown
+            pass
+
+    def work(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                with SessionLocal() as session:
+                    service = ImportJobService(session)
+                    job = service.claim()
+                    if job:
+                        service.run(job, self._stop.is_set, self.invalidate_cache)
+                        continue
+            except Exception:  # pragma: no cover - the job is resumed once its lease expires
+                logger.exception("Erreur du worker d'import")
+            self._wake.wait(self.poll_seconds)
+
+
+import_workers = ImportWorkerPool(settings.import_workers, settings.import_poll_seconds)
+
+
+def start_import_workers() -> ImportWorkerPool:
+    """Start the import workers; called once the tables exist."""
+    if import_workers.workers > 0:
+        import_workers.start()
+        logger.info("%s workers d'import démarrés", import_workers.workers)
+    return import_workers
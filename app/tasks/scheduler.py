@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from datetime import date
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
@@ -9,7 +10,9 @@ from fastapi import FastAPI
 from app.core.config import get_settings
 from app.core.database import SessionLocal
 from app.models.entities import Application
+from app.services.dashboard import DashboardService, dashboard_cache
 from app.services.notifications import NotificationService, format_notification_html
+from app.services.snapshot import DashboardSnapshotService
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -36,9 +39,47 @@ def notify_upcoming_obsolescences() -> None:
                 logger.warning("Échec notification %s: %s", application.name, exc)
 
 
+def rebuild_dashboard_snapshot() -> None:
+    with SessionLocal() as session:
+        try:
+            DashboardSnapshotService(session).rebuild()
+            session.commit()
+            dashboard_cache.invalidate()
+        except Exception:  # pragma: no cover - retried on next run
+            session.rollback()
+            logger.exception("Échec de la reconstruction du snapshot du tableau de bord")
+
+
+def initialize_dashboard_snapshot() -> None:
+    """Build the snapshot of a database that never had one; afterwards deltas and the nightly rebuild keep it current."""
+    with SessionLocal() as session:
+        service = DashboardSnapshotService(session)
+        if service.is_initialized():
+            return
+        try:
+            service.rebuild()
+            session.commit()
+        except Exception:  # pragma: no cover - the dashboard reads the live tables until the nightly rebuild
+            session.rollback()
+            logger.exception("Échec de l'initialisation du snapshot du tableau de bord")
+
+
+def record_dashboard_history() -> None:
+    with SessionLocal() as session:
+        try:
+            count = DashboardService(session).record_history(date.today())
+            session.commit()
+            logger.info("Historique du tableau de bord enregistré pour %s projets", count)
+        except Exception:  # pragma: no cover - retried on next run
+            session.rollback()
+            logger.exception("Échec de l'enregistrement de l'historique du tableau de bord")
+
+
 def start_scheduler(app: FastAPI) -> AsyncIOScheduler:
     scheduler = AsyncIOScheduler(timezone=settings.scheduler_timezone)
     scheduler.add_job(notify_upcoming_obsolescences, CronTrigger(hour=7, minute=0))
+    scheduler.add_job(rebuild_dashboard_snapshot, CronTrigger(hour=2, minute=0))
+    scheduler.add_job(record_dashboard_history, CronTrigger(hour=23, minute=50))
 
     @app.on_event("startup")
     async def start() -> None:  # pragma: no cover - scheduler start
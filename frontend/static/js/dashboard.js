@@ -7,7 +7,10 @@ function dashboard() {
       search: '',
     },
     applications: [],
+    applicationsCursor: null,
+    applicationsQuery: '',
     metrics: null,
+    histogram: null,
     projectsById: {},
     projectOptions: [],
     token: null,
@@ -60,7 +63,10 @@ function dashboard() {
     },
     resetFilters() {
       this.filters = { project: '', criticity: '', status: '', search: '' };
-      this.loadApplications();
+      this.applyFilters();
+    },
+    async applyFilters() {
+      await Promise.all([this.loadMetrics(), this.loadApplications()]);
     },
     async authorizedFetch(url, options = {}) {
       const opts = { ...options, headers: { ...(options.headers || {}) } };
@@ -76,9 +82,7 @@ function dashboard() {
     },
     async loadProjects() {
       try {
-        const response = await this.authorizedFetch(`${this.apiBase()}/projects/`);
-        if (!response.ok) throw new Error('Erreur chargement projets');
-        const projects = await response.json();
+        const projects = await this.fetchAllPages(`${this.apiBase()}/projects/?fields=id,name`);
         this.projectOptions = projects;
         this.projectsById = Object.fromEntries(projects.map((p) => [p.id, p.name]));
       } catch (error) {
@@ -91,24 +95,73 @@ function dashboard() {
       if (this.filters.criticity) params.append('criticity', this.filters.criticity);
       if (this.filters.status) params.append('status', this.filters.status);
       if (this.filters.search) params.append('search', this.filters.search);
+      // Only the columns of the table: descriptions and timestamps are not fetched.
+      params.append('fields', 'id,name,project_id,owner,criticity,status');
       try {
         const response = await this.authorizedFetch(`${this.apiBase()}/applications/?${params.toString()}`);
         if (!response.ok) throw new Error('Erreur chargement applications');
         this.applications = await response.json();
+        this.applicationsCursor = response.headers.get('X-Next-Cursor');
+        this.applicationsQuery = params.toString();
+      } catch (error) {
+        console.error(error);
+      }
+    },
+    async loadMoreApplications() {
+      if (!this.applicationsCursor) return;
+      const params = new URLSearchParams(this.applicationsQuery);
+      params.append('cursor', this.applicationsCursor);
+      try {
+        const response = await this.authorizedFetch(`${this.apiBase()}/applications/?${params.toString()}`);
+        if (!response.ok) throw new Error('Erreur chargement applications');
+        this.applications = this.applications.concat(await response.json());
+        this.applicationsCursor = response.headers.get('X-Next-Cursor');
       } catch (error) {
         console.error(error);
       }
     },
+    async fetchAllPages(url) {
+      // Follows X-Next-Cursor until the last page of a paginated list.
+      const items = [];
+      let cursor = null;
+      do {
+        const pageUrl = new URL(url, window.location.origin);
+        pageUrl.searchParams.set('limit', '500');
+        if (cursor) pageUrl.searchParams.set('cursor', cursor);
+        const response = await this.authorizedFetch(pageUrl.toString());
+        if (!response.ok) throw new Error(`Erreur chargement ${url}`);
+        items.push(...(await response.json()));
+        cursor = response.headers.get('X-Next-Cursor');
+      } while (cursor);
+      return items;
+    },
     async loadMetrics() {
+      const params = new URLSearchParams();
+      if (this.filters.project) params.append('project_id', this.filters.project);
+      if (this.filters.criticity) params.append('criticity', this.filters.criticity);
       try {
-        const response = await this.authorizedFetch(`${this.apiBase()}/dashboard/metrics`);
+        const response = await this.authorizedFetch(`${this.apiBase()}/dashboard/metrics?${params.toString()}`);
         if (!response.ok) throw new Error('Erreur chargement métriques');
         this.metrics = await response.json();
+        await this.loadHistogram(params);
         this.renderCharts();
       } catch (error) {
         console.error(error);
       }
     },
+    async loadHistogram(filterParams) {
+      const params = new URLSearchParams(filterParams);
+      params.append('granularity', 'quarter');
+      params.append('split_by', 'type');
+      try {
+        const response = await this.authorizedFetch(`${this.apiBase()}/dashboard/histogram?${params.toString()}`);
+        if (!response.ok) throw new Error('Erreur chargement histogramme');
+        this.histogram = await response.json();
+      } catch (error) {
+        this.histogram = null;
+        console.error(error);
+      }
+    },
     renderCharts() {
       if (!this.metrics) return;
       const remediationCtx = document.getElementById('remediationChart');
@@ -140,23 +193,32 @@ function dashboard() {
 
       if (timelineCtx) {
         if (this.timelineChart) this.timelineChart.destroy();
-        const labels = Object.keys(timelineData).sort();
+        const seriesLabels = { version: 'Versions', dependency: 'Dépendances' };
+        const seriesColors = { version: '#6366f1', dependency: '#f59e0b' };
+        let labels = Object.keys(timelineData).sort();
+        let datasets = [
+          {
+            label: 'Échéances',
+            data: labels.map((label) => timelineData[label]),
+            backgroundColor: '#6366f1',
+          },
+        ];
+        if (this.histogram) {
+          labels = this.histogram.periods;
+          datasets = this.histogram.series.map((serie) => ({
+            label: seriesLabels[serie.name] || serie.name,
+            data: serie.counts,
+            backgroundColor: seriesColors[serie.name] || '#6366f1',
+          }));
+        }
         this.timelineChart = new Chart(timelineCtx, {
           type: 'bar',
-          data: {
-            labels,
-            datasets: [
-              {
-                label: 'Échéances',
-                data: labels.map((label) => timelineData[label]),
-                backgroundColor: '#6366f1',
-              },
-            ],
-          },
+          data: { labels, datasets },
           options: {
             responsive: true,
             scales: {
-              y: { beginAtZero: true },
+              x: { stacked: true },
+              y: { beginAtZero: true, stacked: true },
             },
           },
         });
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.database import configure_sqlite, engine_options
+from app.models.base import Base
+from app.models.entities import Application, Dependency, DependencyCategory, Project, Version
+from app.services.import_preview import ENTITIES, ImportPreviewService
+from app.services.import_validation import parse_date
+from app.services.importer import CSV_HEADERS, CSVImportService
+from app.services.snapshot import (
+    DashboardSnapshotService,
+    application_contributions,
+    dependency_contributions,
+    version_contributions,
+)
+
+
+def write_csv(path: Path, rows: int) -> None:
+    """An inventory with existing projects/applications, repeated versions and dependencies without version.
+
+    Rows cycle through the applications instead of being grouped like an
+    export, so that every chunk looks up as many applications as possible.
+    """
+    today = date.today()
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(CSV_HEADERS)
+        for index in range(rows):
+            application = index % max(1, rows // 20)
+            writer.writerow(
+                [
+                    f"Projet {application % 50}",
+                    "Équipe",
+                    "contact@example.com",
+                    f"App {application}",
+                    "Description",
+                    "Jean Dupont",
+                    ["faible", "moyenne", "haute", "critique", ""][index % 5],
+                    "active",
+                    # One version in ten is repeated from an earlier row.
+                    f"{index // 10}.0" if index % 10 == 0 else f"{index}.{index % 7}",
+                    (today + timedelta(days=index % 900 - 300)).isoformat(),
+                    "" if index % 3 else (today + timedelta(days=400)).strftime("%d/%m/%Y"),
+                    ["os", "runtime", "librairie", "", "inconnue"][index % 5],
+                    f"lib{index % 40}",
+                    "" if index % 4 == 0 else str(index % 6),
+                    (today + timedelta(days=index % 700 - 100)).isoformat() if index % 2 else "",
+                ]
+            )
+
+
+def seed(engine) -> None:
+    """Some of the imported projects, applications and versions already exist."""
+    with Session(engine) as session:
+        session.execute(insert(Project), [{"name": f"Projet {index}"} for index in range(0, 50, 2)])
+        session.execute(
+            insert(Application), [{"name": f"App {index}", "project_id": index // 2 + 1} for index in range(0, 50, 2)]
+        )
+        session.execute(insert(Version), [{"application_id": 1, "number": "0.0"}, {"application_id": 2, "number": "1.0"}])
+        session.commit()
+
+
+def legacy_import(session: Session, path: Path) -> Dict[str, int]:
+    """The importer before the set-based rework: lookups and a flush for every row."""
+    created: Counter = Counter()
+    delta: Counter = Counter()
+    with path.open(newline="", encoding="utf-8-sig") as handle:
+        for row in csv.DictReader(handle):
+            project = session.query(Project).filter(Project.name == row["project_name"].strip()).one_or_none()
+            if not project:
+                project = Project(name=row["project_name"].strip(), team=row["project_team"], contact=row["project_contact"])
+                session.add(project)
+                session.flush()
+                created["projects"] += 1
+            name = row["application_name"].strip()
+            application = (
+                session.query(Application)
+                .filter(Application.name == name, Application.project_id == project.id)
+                .one_or_none()
+            )
+            if not application:
+                application = Application(
+                    name=name,
+                    project_id=project.id,
+                    description=row["application_description"],
+                    owner=row["application_owner"],
+                    criticity=row["application_criticity"] or None,
+                    status=row["application_status"] or None,
+                )
+                session.add(application)
+                session.flush()
+                created["applications"] += 1
+                delta.update(application_contributions(application))
+            if row.get("version_number"):
+                existing = (
+                    session.query(Version)
+                    .filter(Version.application_id == application.id, Version.number == row["version_number"])
+                    .one_or_none()
+                )
+                if not existing:
+                    version = Version(
+                        application_id=application.id,
+                        number=row["version_number"],
+                        end_of_support=parse_date(row["version_end_of_support"]),
+                        end_of_contract=parse_date(row["version_end_of_contract"]),
+                    )
+                    session.add(version)
+                    session.flush()
+                    created["versions"] += 1
+                    delta.update(version_contributions(version))
+            if row.get("dependency_name"):
+                try:
+                    category = DependencyCategory(row.get("dependency_category") or DependencyCategory.other.value)
+                except ValueError:
+                    category = DependencyCategory.other
+                existing = (
+                    session.query(Dependency)
+                    .filter(
+                        Dependency.application_id == application.id,
+                        Dependency.name == row["dependency_name"],
+                        Dependency.version == row.get("dependency_version"),
+                    )
+                    .one_or_none()
+                )
+                if not existing:
+                    dependency = Dependency(
+                        application_id=application.id,
+                        category=category,
+                        name=row["dependency_name"],
+                        version=row.get("dependency_version"),
+                        end_of_support=parse_date(row.get("dependency_end_of_support")),
+                    )
+                    session.add(dependency)
+                    session.flush()
+                    created["dependencies"] += 1
+                    delta.update(dependency_contributions(dependency))
+    DashboardSnapshotService(session).apply(added=delta)
+    session.commit()
+    return {f"{kind}_created": created[kind] for kind in ("projects", "applications", "versions", "dependencies")}
+
+
+def inventory(session: Session) -> List[tuple]:
+    """Imported data without ids nor timestamps, to compare two databases."""
+    statement = (
+        select(
+            Project.name,
+            Project.team,
+            Application.name,
+            Application.criticity,
+            Application.status,
+            Version.number,
+            Version.end_of_support,
+            Version.end_of_contract,
+            Version.remediation_status,
+        )
+        .join(Application, Application.project_id == Project.id)
+        .join(Version, Version.application_id == Application.id, isouter=True)
+    )
+    dependencies = select(
+        Application.name, Dependency.category, Dependency.name, Dependency.version, Dependency.end_of_support
+    ).join(Application, Dependency.application_id == Application.id)
+    rows = [tuple(map(str, row)) for row in session.execute(statement)]
+    rows += [tuple(map(str, row)) for row in session.execute(dependencies)]
+    snapshot = DashboardSnapshotService(session).dashboard_counters(date.today())
+    return sorted(rows) + [tuple(map(str, snapshot))]
+
+
+def run(path: Path, legacy: bool, compare: bool, workers: Optional[int] = None) -> tuple:
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/bench.db"
+        engine = create_engine(url, future=True, **engine_options(url))
+        configure_sqlite(engine, url)
+        Base.metadata.create_all(engine)
+        seed(engine)
+        with Session(engine) as session:
+            DashboardSnapshotService(session).rebuild()
+            session.commit()
+            preview = None
+            if not legacy:
+                started = time.perf_counter()
+                with path.open("rb") as handle:
+                    counts = ImportPreviewService(session).preview(handle, workers=workers)
+                preview = (
+                    time.perf_counter() - started,
+                    {f"{entity}_created": counts[entity]["created"] for entity in ENTITIES},
+                )
+            started = time.perf_counter()
+            if legacy:
+                result = legacy_import(session, path)
+            else:
+                with path.open("rb") as handle:
+                    result = CSVImportService(session).import_stream(handle, workers=workers)
+            elapsed = time.perf_counter() - started
+            content = inventory(session) if compare else None
+        engine.dispose()
+        return result, elapsed, content, preview
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mesurer l'import CSV (ligne à ligne ou ensembliste) et sa simulation")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="Tailles de fichier")
+    parser.add_argument(
+        "--legacy-max", type=int, default=10_000, help="Taille maximale importée aussi ligne à ligne pour comparaison"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Processus de validation (IMPORT_VALIDATION_WORKERS par défaut)"
+    )
+    args = parser.parse_args()
+
+    different = 0
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            path = Path(directory) / f"inventory-{rows}.csv"
+            write_csv(path, rows)
+            size = path.stat().st_size / 1e6
+            compare = rows <= args.legacy_max
+            result, elapsed, content, (preview_elapsed, preview) = run(path, legacy=False, compare=compare, workers=args.workers)
+            line = (
+                f"{rows:>9} lignes ({size:6.1f} Mo)   simulation {preview_elapsed:7.2f} s"
+                f"{'' if preview == result else ' DIFFÉRENTE'}   ensembliste {elapsed:7.2f} s ({rows / elapsed:8.0f} lignes/s)"
+            )
+            different += preview != result
+            if compare:
+                expected, legacy_elapsed, expected_content, _ = run(path, legacy=True, compare=True)
+                identical = expected == result and expected_content == content
+                different += not identical
+                line += (
+                    f"   ligne à ligne {legacy_elapsed:7.2f} s   x{legacy_elapsed / elapsed:5.1f}"
+                    f"   {'identique' if identical else 'DIFFÉRENT'}"
+                )
+            print(line)
+            print(f"{'':>9} {result}")
+            path.unlink()
+    sys.exit(1 if different else 0)
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# The benchmark runs against its own throw-away database.
+WORK_DIR = tempfile.mkdtemp(prefix="bench-lists-")
+os.environ["DATABASE_URL"] = f"sqlite:///{WORK_DIR}/bench.db"
+os.environ["SCHEDULER_ENABLED"] = "False"
+os.environ["LOG_LEVEL"] = "WARNING"
+
+from fastapi import Depends, FastAPI, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select
+
+from app.api.deps import get_current_user
+from app.api.pagination import PageParams, page_params, paginate
+from app.core.database import Base, SessionLocal, engine, get_read_db
+from app.main import app
+from app.models import entities as models
+from app.schemas import entities as schemas
+from app.utils.security import create_access_token, get_password_hash
+
+# path, response model, model, order: the list endpoints as they were before
+# the Core read path (ORM objects validated by the response model).
+ENDPOINTS = [
+    ("/projects/", schemas.Project, models.Project, [(models.Project.name, False), (models.Project.id, False)]),
+    (
+        "/applications/",
+        schemas.Application,
+        models.Application,
+        [(models.Application.name, False), (models.Application.id, False)],
+    ),
+    (
+        "/notifications/",
+        schemas.Notification,
+        models.Notification,
+        [(models.Notification.sent_at, True), (models.Notification.id, True)],
+    ),
+    ("/users/", schemas.User, models.User, [(models.User.email, False), (models.User.id, False)]),
+    (
+        "/catalog/",
+        schemas.TechnologyLifecycle,
+        models.TechnologyLifecycle,
+        [(models.TechnologyLifecycle.name, False), (models.TechnologyLifecycle.id, False)],
+    ),
+    (
+        "/action-plans/",
+        schemas.ActionPlan,
+        models.ActionPlan,
+        [(models.ActionPlan.due_date, False), (models.ActionPlan.id, False)],
+    ),
+]
+
+
+def orm_route(model, order):
+    async def endpoint(
+        response: Response,
+        page: PageParams = Depends(page_params),
+        db=Depends(get_read_db),
+        __: None = Depends(get_current_user),
+    ):
+        return await paginate(db, select(model), order, page, response)
+
+    return endpoint
+
+
+def orm_app() -> FastAPI:
+    legacy = FastAPI()
+    for path, schema, model, order in ENDPOINTS:
+        legacy.add_api_route(path, orm_route(model, order), response_model=List[schema])
+    return legacy
+
+
+def seed(rows: int) -> int:
+    Base.metadata.create_all(engine)
+    today = date.today()
+    now = datetime(2025, 6, 1, 8, 30, 15, 123456)
+    with SessionLocal() as session:
+        session.execute(insert(models.Project), [{"name": f"Projet {index:04d}", "team": "Équipe"} for index in range(50)])
+        session.execute(
+            insert(models.Application),
+            [
+                {
+                    "name": f"Application {index:05d} é",
+                    "project_id": index % 50 + 1,
+                    "owner": "Jean Dupont",
+                    "criticity": list(models.CriticityLevel)[index % 4],
+                }
+                for index in range(rows)
+            ],
+        )
+        session.execute(
+            insert(models.Notification),
+            [
+                {
+                    "target_type": "application",
+                    "target_id": index % rows + 1,
+                    "type": models.NotificationType.email,
+                    "recipients": "ops@example.com, Jean Dupont",
+                    "sent_at": now - timedelta(minutes=index),
+                    "status": "envoyé",
+                    "message": "<p>Fin de support</p>",
+                }
+                for index in range(rows)
+            ],
+        )
+        session.execute(
+            insert(models.User),
+            [
+                {
+                    "name": f"Utilisateur {index}",
+                    "email": f"user{index:05d}@example.com",
+                    "role": models.UserRole.admin if index == 0 else models.UserRole.reader,
+                    "password_hash": get_password_hash("ChangeMe123!") if index == 0 else "x",
+                    "last_login": now if index % 2 else None,
+                }
+                for index in range(rows)
+            ],
+        )
+        session.execute(
+            insert(models.TechnologyLifecycle),
+            [{"type": "runtime", "name": f"Techno {index:05d}", "vendor": "Éditeur"} for index in range(rows)],
+        )
+        session.execute(
+            insert(models.ActionPlan),
+            [
+                {
+                    "application_id": index % rows + 1,
+                    "title": f"Plan {index}",
+                    "due_date": today + timedelta(days=index % 400) if index % 5 else None,
+                }
+                for index in range(rows)
+            ],
+        )
+        session.commit()
+        return session.scalars(select(models.User.id).where(models.User.role == models.UserRole.admin)).one()
+
+
+def requests_per_second(client: TestClient, url: str, headers: dict, duration: float) -> float:
+    count, started = 0, time.perf_counter()
+    while time.perf_counter() - started < duration:
+        assert client.get(url, headers=headers).status_code == 200
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Comparer les listes ORM + pydantic et Core + orjson")
+    parser.add_argument("--rows", type=int, default=2000, help="Lignes par table")
+    parser.add_argument("--limit", type=int, default=500, help="Taille de page demandée")
+    parser.add_argument("--duration", type=float, default=3.0, help="Durée de chaque mesure en secondes")
+    args = parser.parse_args()
+
+    admin_id = seed(args.rows)
+    token, _ = create_access_token(str(admin_id))
+    headers = {"Authorization": f"Bearer {token}"}
+    different = 0
+    with TestClient(app) as fast, TestClient(orm_app()) as orm:
+        for path, *_ in ENDPOINTS:
+            url = f"{path}?limit={args.limit}"
+            expected = orm.get(url, headers=headers)
+            actual = fast.get(f"/api/v1{url}", headers=headers)
+            identical = expected.content == actual.content
+            different += not identical
+            before = requests_per_second(orm, url, headers, args.duration)
+            after = requests_per_second(fast, f"/api/v1{url}", headers, args.duration)
+            print(
+                f"{path:<16} ORM {before:7.1f} req/s   Core+orjson {after:7.1f} req/s"
+                f"   x{after / before:4.2f}   {'identique' if identical else 'DIFFÉRENT'}"
+            )
+    sys.exit(1 if different else 0)
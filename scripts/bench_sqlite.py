@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import create_engine, func, insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.database import configure_sqlite, engine_options
+from app.models.base import Base
+from app.models.entities import Application, Project, Version
+
+# Default: SQLite as shipped (rollback journal, synchronous=FULL), no pragma at all.
+PROFILES: Dict[str, Optional[dict]] = {"défaut": {}, "production": None}
+
+
+def seed(engine, applications: int, versions: int) -> None:
+    with Session(engine) as session:
+        session.execute(insert(Project), [{"name": "Bench"}])
+        session.execute(
+            insert(Application), [{"name": f"App {index}", "project_id": 1} for index in range(applications)]
+        )
+        session.execute(
+            insert(Version),
+            [
+                {
+                    "application_id": index % applications + 1,
+                    "number": f"{index}.0",
+                    "end_of_support": date.today() + timedelta(days=index % 900 - 300),
+                }
+                for index in range(versions)
+            ],
+        )
+        session.commit()
+
+
+def run_profile(pragmas: Optional[dict], readers: int, writers: int, duration: float) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/bench.db"
+        engine = create_engine(url, future=True, **engine_options(url))
+        configure_sqlite(engine, url, pragmas)
+        Base.metadata.create_all(engine)
+        seed(engine, applications=200, versions=20000)
+
+        counts = {"lectures": 0, "écritures": 0, "verrous": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + duration
+
+        def reader() -> None:
+            statement = (
+                select(Version.application_id, func.count(Version.id))
+                .where(Version.end_of_support < date.today() + timedelta(days=180))
+                .group_by(Version.application_id)
+            )
+            while time.perf_counter() < deadline:
+                with Session(engine) as session:
+                    session.execute(statement).all()
+                with lock:
+                    counts["lectures"] += 1
+
+        def writer(offset: int) -> None:
+            iteration = 0
+            while time.perf_counter() < deadline:
+                iteration += 1
+                try:
+                    with Session(engine) as session:
+                        session.execute(
+                            update(Version)
+                            .where(Version.id == (offset * 7919 + iteration) % 20000 + 1)
+                            .values(end_of_support=date.today() + timedelta(days=iteration % 700))
+                        )
+                        session.commit()
+                    key = "écritures"
+                except OperationalError:
+                    key = "verrous"
+                with lock:
+                    counts[key] += 1
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads += [threading.Thread(target=writer, args=(index,)) for index in range(writers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        engine.dispose()
+    return {
+        "lectures/s": counts["lectures"] / elapsed,
+        "écritures/s": counts["écritures"] / elapsed,
+        "verrous": counts["verrous"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Comparer le débit SQLite avec et sans le profil de production")
+    parser.add_argument("--readers", type=int, default=4, help="Threads de lecture")
+    parser.add_argument("--writers", type=int, default=2, help="Threads d'écriture")
+    parser.add_argument("--duration", type=float, default=5.0, help="Durée de chaque mesure en secondes")
+    args = parser.parse_args()
+    for name, pragmas in PROFILES.items():
+        result = run_profile(pragmas, args.readers, args.writers, args.duration)
+        print(f"{name:<12} " + "  ".join(f"{key}={value:.0f}" for key, value in result.items()))
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import os
+import tempfile
+
+# Two SQLite files stand in for the MariaDB primary and its replica; they must
+# be configured before the application creates its engines.
+DATA_DIRECTORY = tempfile.mkdtemp(prefix="obsolescences-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{DATA_DIRECTORY}/primary.db",
+    DATABASE_READ_URL=f"sqlite:///{DATA_DIRECTORY}/replica.db",
+    IMPORT_DIRECTORY=f"{DATA_DIRECTORY}/imports",
+    IMPORT_WORKERS="0",
+    SCHEDULER_ENABLED="false",
+)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Callable, Iterator, List, Tuple
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+
+from app.api.pagination import keyset_condition
+from app.models.base import Base
+from app.models.entities import Application, Comment, Dependency, Notification, TimelineEvent, Version
+from app.schemas.filters import DashboardFilter
+from app.services.dashboard import DashboardService
+from app.services.notifications import NotificationService
+
+# (description, callable issuing the queries, indexes that must appear in the plans)
+QueryCheck = Tuple[str, Callable[[Session], object], Tuple[str, ...]]
+
+
+def keyset_page(model, order, cursor, *criteria):
+    condition = keyset_condition(order, cursor)
+    sort = [column.desc() if descending else column for column, descending in order]
+    return lambda db: db.scalars(select(model).where(*criteria, condition).order_by(*sort).limit(101)).all()
+
+
+CHECKS: List[QueryCheck] = [
+    (
+        "historique d'une application",
+        lambda db: db.query(TimelineEvent)
+        .filter(TimelineEvent.application_id == 1)
+        .order_by(TimelineEvent.created_at.desc())
+        .all(),
+        ("ix_timeline_events_application_id_created_at",),
+    ),
+    (
+        "commentaires d'une application",
+        lambda db: db.query(Comment).filter(Comment.application_id == 1).order_by(Comment.created_at.desc()).all(),
+        ("ix_comments_application_id_created_at",),
+    ),
+    (
+        "journal des notifications",
+        lambda db: db.query(Notification).order_by(Notification.sent_at.desc()).all(),
+        ("ix_notifications_sent_at",),
+    ),
+    (
+        "page profonde du journal des notifications",
+        keyset_page(Notification, [(Notification.sent_at, True), (Notification.id, True)], [datetime(2025, 1, 1), 10]),
+        ("ix_notifications_sent_at",),
+    ),
+    (
+        "page profonde de l'historique d'une application",
+        keyset_page(
+            TimelineEvent,
+            [(TimelineEvent.created_at, True), (TimelineEvent.id, True)],
+            [datetime(2025, 1, 1), 10],
+            TimelineEvent.application_id == 1,
+        ),
+        ("ix_timeline_events_application_id_created_at",),
+    ),
+    (
+        "page profonde des applications",
+        keyset_page(Application, [(Application.name, False), (Application.id, False)], ["Portail", 10]),
+        ("ix_applications_name",),
+    ),
+    (
+        "échéances à venir",
+        lambda db: NotificationService(db).upcoming_obsolescences(6),
+        ("ix_versions_end_of_support", "ix_dependencies_end_of_support"),
+    ),
+    (
+        "versions d'une application",
+        lambda db: db.query(Version).filter(Version.application_id == 1).all(),
+        ("ix_versions_application_id_end_of_support",),
+    ),
+    (
+        "dépendances d'une application",
+        lambda db: db.query(Dependency).filter(Dependency.application_id == 1).all(),
+        ("ix_dependencies_application_id_end_of_support",),
+    ),
+    (
+        "applications d'un projet",
+        lambda db: db.query(Application).filter(Application.project_id == 1).all(),
+        ("ix_applications_project_id_criticity",),
+    ),
+    (
+        "dépendances partagées d'une technologie",
+        lambda db: DashboardService(db).shared_dependency_alerts(filters=DashboardFilter(technology="log4j")),
+        ("ix_dependencies_name_end_of_support", "ix_dependencies_normalized_name"),
+    ),
+    (
+        "histogramme sur une fenêtre de dates",
+        lambda db: DashboardService(db).deadline_histogram(start=date(2025, 1, 1), end=date(2026, 12, 31)),
+        ("ix_versions_end_of_support", "ix_dependencies_end_of_support"),
+    ),
+]
+
+
+@contextmanager
+def captured_statements(session: Session) -> Iterator[list]:
+    statements: list = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def query_plans(session: Session, run: Callable[[Session], object]) -> List[str]:
+    with captured_statements(session) as statements:
+        run(session)
+    connection = session.connection()
+    return [
+        "\n".join(row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+        for statement, parameters in statements
+    ]
+
+
+@pytest.fixture(scope="module")
+def session() -> Iterator[Session]:
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.mark.parametrize("description, run, index_names", CHECKS, ids=[check[0] for check in CHECKS])
+def test_query_uses_index(session: Session, description: str, run, index_names: Tuple[str, ...]) -> None:
+    plans = "\n".join(query_plans(session, run))
+    for index_name in index_names:
+        assert re.search(rf"INDEX {index_name}\b", plans), f"{description} n'utilise pas {index_name} :\n{plans}"
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import async_engine
+from app.main import app
+from app.models.base import Base
+from app.models.entities import Project, User, UserRole
+from app.utils.security import create_access_token, get_password_hash
+
+
+@pytest.fixture(scope="module")
+def client() -> Iterator[TestClient]:
+    settings = get_settings()
+    # The same user on both databases, but a different project on each.
+    for database_url, project_name in (
+        (settings.database_url, "Projet du primaire"),
+        (settings.database_read_url, "Projet de la réplique"),
+    ):
+        engine = create_engine(database_url)
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            user = User(
+                id=1,
+                name="Contributrice",
+                email="contributrice@example.com",
+                role=UserRole.contributor,
+                password_hash=get_password_hash("ChangeMe123!"),
+            )
+            session.add_all([user, Project(name=project_name)])
+            session.commit()
+        engine.dispose()
+    token, _ = create_access_token("1")
+    with TestClient(app) as client:
+        client.headers["Authorization"] = f"Bearer {token}"
+        yield client
+
+
+@contextmanager
+def primary_statements() -> Iterator[List[str]]:
+    statements: List[str] = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+
+def project_names(client: TestClient) -> List[str]:
+    response = client.get("/api/v1/projects/")
+    assert response.status_code == 200, response.text
+    return [project["name"] for project in response.json()]
+
+
+def test_reads_are_served_by_the_replica_without_querying_the_primary(client: TestClient) -> None:
+    with primary_statements() as statements:
+        assert project_names(client) == ["Projet de la réplique"]
+    assert statements == []
+
+
+def test_reads_stay_on_the_primary_after_a_write(client: TestClient) -> None:
+    response = client.post("/api/v1/projects/", json={"name": "Nouveau projet"})
+    assert response.status_code == 201, response.text
+    assert project_names(client) == ["Nouveau projet", "Projet du primaire"]
+
+    # Without the stickiness cookie, reads go back to the replica.
+    client.cookies.clear()
+    assert project_names(client) == ["Projet de la réplique"]